@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, Response, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 import httpx
 
 from app.schemas.base_response_schema import BaseResponse
 from app.schemas.user_schema import UserCreate, UserLogin, User, UserUpdate
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.dependency import get_user_id
 from app.services.authentication_service import AuthenticationService
 from app.core.config import settings
@@ -16,10 +16,10 @@ router = APIRouter(tags=["Authentication"])
 
 
 @router.post("/signup", response_model=User)
-async def signup(response: Response, user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(response: Response, user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthenticationService(db)
 
-    user = auth_service.register_user(user_data)
+    user = await auth_service.register_user(user_data)
     token = auth_service.create_tokens(str(user.id))
 
     response.set_cookie(
@@ -46,10 +46,10 @@ async def signup(response: Response, user_data: UserCreate, db: Session = Depend
 
 
 @router.post("/login", response_model=User)
-async def login(response: Response, user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(response: Response, user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthenticationService(db)
 
-    user = auth_service.authenticate_user(user_data)
+    user = await auth_service.authenticate_user(user_data)
     token = auth_service.create_tokens(str(user.id))
 
     response.set_cookie(
@@ -91,10 +91,10 @@ async def login_oauth(client_redirect_url: str, oauth_provider: str = "google"):
 
 
 @router.get("/oauth/callback/{oauth_provider}", response_class=RedirectResponse)
-async def login_oauth_callback(oauth_provider: str, code: str, state:str, db: Session = Depends(get_db)):
+async def login_oauth_callback(oauth_provider: str, code: str, state:str, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthenticationService(db)
 
-    user = auth_service.authenticate_user_oauth(oauth_provider, code)
+    user = await auth_service.authenticate_user_oauth(oauth_provider, code)
     token = auth_service.create_tokens(str(user.id))
 
     response = RedirectResponse(state)
@@ -123,11 +123,11 @@ async def login_oauth_callback(oauth_provider: str, code: str, state:str, db: Se
 
 
 @router.post("/refresh", response_model=BaseResponse)
-async def refresh(request: Request, response: Response, db: Session = Depends(get_db)):
+async def refresh(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     auth_service = AuthenticationService(db)
     refresh_token = request.cookies.get("refreshToken")
 
-    token = auth_service.refresh_access_token(refresh_token)
+    token = await auth_service.refresh_access_token(refresh_token)
     response.set_cookie(
         key="accessToken",
         value=token.access_token,
@@ -153,23 +153,23 @@ async def refresh(request: Request, response: Response, db: Session = Depends(ge
 
 @router.get("/me", response_model=User)
 async def get_user_details(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_user_id)
 ):
     auth_service = AuthenticationService(db)
 
-    return auth_service.get_user_details_by_id(user_id)
+    return await auth_service.get_user_details_by_id(user_id)
 
 
 @router.patch("/update-profile", response_model=BaseResponse)
 async def update_profile(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_user_id)
 ):
     auth_service = AuthenticationService(db)
 
-    return auth_service.update_user_img(user_update, user_id)
+    return await auth_service.update_user_img(user_update, user_id)
 
 
 @router.post("/logout", response_model=BaseResponse)
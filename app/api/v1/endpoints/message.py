@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependency import get_user_id, get_protection_agent, get_adversary_agent
+from app.core.dependency import get_user_id, get_protection_agent, get_adversary_agent, get_vdb, get_verdict_worker_pool, get_title_worker_pool
 from app.schemas.message_schema import MessageCreate, Message
 from app.schemas.base_response_schema import BaseResponse
-from app.core.database import get_db
+from app.schemas.protection_schema import VerdictStatus
 from app.services.messaging_service import MessagingService
 from app.infrastructures.protection_agent.base import ProtectionAgentBase
 from app.infrastructures.adversary.base import AdversaryBase
 from app.infrastructures.vdb.base import VectorDBBase
-from app.infrastructures.vdb.qdrant_vdb import QdrantVDB
+from app.utils.worker_pool import BoundedWorkerPool
 
 
 router = APIRouter(tags=["Message"])
@@ -20,13 +19,14 @@ router = APIRouter(tags=["Message"])
 @router.post("/send", response_class=StreamingResponse)
 async def send_message(
     message_data: MessageCreate,
-    db: Session = Depends(get_db),
-    vdb: VectorDBBase = Depends(QdrantVDB),
+    vdb: VectorDBBase = Depends(get_vdb),
     user_id: str = Depends(get_user_id),
     protection_agent: ProtectionAgentBase = Depends(get_protection_agent),
-    adversary_agent: AdversaryBase = Depends(get_adversary_agent)
+    adversary_agent: AdversaryBase = Depends(get_adversary_agent),
+    verdict_worker_pool: BoundedWorkerPool = Depends(get_verdict_worker_pool),
+    title_worker_pool: BoundedWorkerPool = Depends(get_title_worker_pool)
 ):
-    messaging_service = MessagingService(db, vdb, user_id)
+    messaging_service = MessagingService(vdb, user_id, verdict_worker_pool, title_worker_pool)
     
     return StreamingResponse(
         messaging_service.send_message(message_data, protection_agent, adversary_agent),
@@ -37,19 +37,42 @@ async def send_message(
 @router.get("/", response_model=List[Message])
 async def load_messages_from_conversation(
     conversation_id: str,
-    db: Session = Depends(get_db),
-    vdb: VectorDBBase = Depends(QdrantVDB),
+    vdb: VectorDBBase = Depends(get_vdb),
     user_id: str = Depends(get_user_id)
 ):
-    messaging_service = MessagingService(db, vdb, user_id)
+    messaging_service = MessagingService(vdb, user_id)
 
-    return messaging_service.load_messages_by_conversation(conversation_id)
+    return await messaging_service.load_messages_by_conversation(conversation_id)
+
+
+@router.get("/verdict", response_model=VerdictStatus)
+async def get_message_verdict(
+    message_id: str,
+    vdb: VectorDBBase = Depends(get_vdb),
+    user_id: str = Depends(get_user_id)
+):
+    messaging_service = MessagingService(vdb, user_id)
+
+    return await messaging_service.get_message_verdict(message_id)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(
+    user_id: str = Depends(get_user_id)
+):
+    messaging_service = MessagingService(None, user_id)
+
+    return StreamingResponse(
+        messaging_service.stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.patch("/threat-status", response_model=BaseResponse)
 async def test_embedding(
     message_id: str,
-    vdb: VectorDBBase = Depends(QdrantVDB)
+    vdb: VectorDBBase = Depends(get_vdb)
 ):
 
     return BaseResponse(detail="Threat status has been updated")
\ No newline at end of file
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+
+from app.core.database import get_pool_status
+from app.core.exceptions import NotFoundException
+from app.infrastructures.protection_agent.verdict_cache import get_verdict_cache
+from app.services.protection_service import protection_tier_stats, protection_stage_stats
+from app.core.dependency import get_user_id, get_verdict_worker_pool, get_title_worker_pool
+from app.utils.worker_pool import BoundedWorkerPool
+from app.schemas.metrics_schema import DatabasePoolsStatus, VerdictCacheStatus, ProtectionTierStatus, ProtectionStageStatus, WorkerPoolStatus
+
+
+router = APIRouter(tags=["Metrics"], dependencies=[Depends(get_user_id)])
+
+
+@router.get("/db-pool", response_model=DatabasePoolsStatus)
+async def get_database_pool_status():
+    return DatabasePoolsStatus(**get_pool_status())
+
+
+@router.get("/verdict-cache", response_model=VerdictCacheStatus)
+async def get_verdict_cache_status():
+    verdict_cache = get_verdict_cache()
+    if not verdict_cache:
+        raise NotFoundException(detail="Verdict cache is disabled")
+
+    return VerdictCacheStatus(**verdict_cache.stats())
+
+
+@router.get("/protection-tiers", response_model=ProtectionTierStatus)
+async def get_protection_tier_status():
+    return ProtectionTierStatus(**protection_tier_stats.stats())
+
+
+@router.get("/protection-stages", response_model=ProtectionStageStatus)
+async def get_protection_stage_status():
+    return ProtectionStageStatus(**protection_stage_stats.stats())
+
+
+@router.get("/verdict-workers", response_model=WorkerPoolStatus)
+async def get_verdict_worker_status(
+    verdict_worker_pool: BoundedWorkerPool = Depends(get_verdict_worker_pool)
+):
+    return WorkerPoolStatus(**verdict_worker_pool.stats())
+
+
+@router.get("/title-workers", response_model=WorkerPoolStatus)
+async def get_title_worker_status(
+    title_worker_pool: BoundedWorkerPool = Depends(get_title_worker_pool)
+):
+    return WorkerPoolStatus(**title_worker_pool.stats())
@@ -0,0 +1,76 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli snapshot-export --output ./snapshots/threats [--source qdrant] [--dtype int8]
+    python -m app.cli snapshot-import --input ./snapshots/threats [--target numpy]
+
+A NumPy VDB can also load a snapshot itself on startup, see NUMPY_VDB_SNAPSHOT_PATH.
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.infrastructures.vdb.provider import VectorDBProvider
+from app.infrastructures.vdb.numpy_vdb import NumpyVDB
+from app.infrastructures.vdb.snapshot import ThreatSnapshot, write_snapshot
+
+
+def snapshot_export(args: argparse.Namespace):
+    vdb = VectorDBProvider().get_vdb(args.source)
+    vdb.initialize()
+
+    try:
+        started = time.perf_counter()
+        count = write_snapshot(args.output, vdb.iter_points(args.batch_size), vdb.vec_dim, args.dtype)
+        print(f"Exported {count} points from {args.source} to {args.output} in {time.perf_counter() - started:.1f}s")
+
+    finally:
+        vdb.close()
+
+
+def snapshot_import(args: argparse.Namespace):
+    snapshot = ThreatSnapshot(args.input)
+    vdb = VectorDBProvider().get_vdb(args.target)
+    if snapshot.dim != vdb.vec_dim:
+        raise ValueError(f"Snapshot dimension {snapshot.dim} does not match EMBEDDING_DIM {vdb.vec_dim}")
+    if isinstance(vdb, NumpyVDB) and not vdb.path:
+        raise ValueError(
+            "Importing into an in-memory NumPy VDB would discard the points, set NUMPY_VDB_PATH "
+            "or load the snapshot on startup with NUMPY_VDB_SNAPSHOT_PATH"
+        )
+    vdb.initialize()
+
+    try:
+        started = time.perf_counter()
+        for vectors, payloads in snapshot.iter_batches(args.batch_size):
+            vdb.add_vectors(vectors, payloads)
+        print(f"Imported {len(snapshot)} points from {args.input} into {args.target} in {time.perf_counter() - started:.1f}s")
+
+    finally:
+        vdb.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("snapshot-export", help="write the threat index to a snapshot directory")
+    export_parser.add_argument("--output", required=True)
+    export_parser.add_argument("--source", default="qdrant")
+    export_parser.add_argument("--dtype", choices=["float32", "int8"], default="float32")
+    export_parser.add_argument("--batch-size", type=int, default=1024)
+    export_parser.set_defaults(handler=snapshot_export)
+
+    import_parser = subparsers.add_parser("snapshot-import", help="load a snapshot directory into a vector database")
+    import_parser.add_argument("--input", required=True)
+    import_parser.add_argument("--target", default=settings.VDB_BACKEND)
+    import_parser.add_argument("--batch-size", type=int, default=4096)
+    import_parser.set_defaults(handler=snapshot_import)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
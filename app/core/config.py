@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -16,17 +16,110 @@ class Settings(BaseSettings):
 
     # DATABASE CONFIGURATION
     DATABASE_URL: str = ""
+    ASYNC_DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
 
     # GEMINI CONFIGURATION
     GEMINI_API_KEY: str = ""
 
+    # IMAGE ANALYSIS
+    IMAGE_ANALYSIS_MAX_IMAGES: int = 8
+    IMAGE_ANALYSIS_MAX_CONCURRENCY: int = 4
+    IMAGE_ANALYSIS_TIMEOUT: float = 15.0
+    IMAGE_MAX_BYTES: int = 5 * 1024 * 1024
+    IMAGE_DESCRIPTION_CACHE_MAX_SIZE: int = 2048
+    IMAGE_DESCRIPTION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # OUTBOUND HTTP CLIENT
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_TIMEOUT: float = 15.0
+
+    # STREAMING PROTECTION
+    STREAMING_PROTECTION_ENABLED: bool = False
+    STREAMING_PROTECTION_CHECKPOINT: str = "sentence"  # "sentence" or "tokens"
+    STREAMING_PROTECTION_TOKEN_INTERVAL: int = 50
+    STREAMING_PROTECTION_MIN_CHARS: int = 40
+    STREAMING_PROTECTION_ABORT_ON_THREAT: bool = True
+
+    # PROTECTION PRE-FILTER
+    PREFILTER_ENABLED: bool = False
+    PREFILTER_MALICIOUS_THRESHOLD: float = 10.0 # only strong indicators count towards it
+    PREFILTER_PHISHING_DOMAINS: List[str] = []
+
+    # PROTECTION BATCHING (one model call carries the conversations of several users)
+    PROTECTION_BATCH_ENABLED: bool = False
+    PROTECTION_BATCH_MAX_SIZE: int = 8
+    PROTECTION_BATCH_MAX_WAIT: float = 0.05
+
+    # VERDICT CACHE
+    VERDICT_CACHE_ENABLED: bool = True
+    VERDICT_CACHE_BACKEND: str = "memory"
+    VERDICT_CACHE_MAX_SIZE: int = 10000
+    VERDICT_CACHE_TTL_SECONDS: int = 86400
+    VERDICT_CACHE_INCLUDE_CONTEXT: bool = False
+    VERDICT_CACHE_CONTEXT_LINES: int = 4
+
+    # SEMANTIC VERDICT
+    SEMANTIC_VERDICT_ENABLED: bool = False
+    SEMANTIC_VERDICT_THRESHOLD: float = 0.95
+
+    # DEFERRED VERDICT
+    DEFERRED_VERDICT_WORKERS: int = 8
+    DEFERRED_VERDICT_QUEUE_SIZE: int = 256
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    # CONVERSATION TITLE
+    LLM_TITLE_ENABLED: bool = True
+    TITLE_MAX_WORDS: int = 8
+    TITLE_WORKERS: int = 2
+    TITLE_QUEUE_SIZE: int = 256
+
+    # VDB OUTBOX
+    VDB_OUTBOX_BATCH_SIZE: int = 100
+    VDB_OUTBOX_POLL_INTERVAL: float = 1.0
+    VDB_OUTBOX_BACKOFF_BASE: float = 2.0
+    VDB_OUTBOX_MAX_BACKOFF: float = 300.0
+    VDB_OUTBOX_CLAIM_TIMEOUT: float = 120.0
+
     # QDRANT VDB
     QDRANT_API_KEY: str = ""
     QDRANT_HOST: str = ""
+    QDRANT_POOL_SIZE: int = 20
+    QDRANT_TIMEOUT: int = 10
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_ASYNC_CLIENT_ENABLED: bool = True
+
+    # QDRANT COLLECTION (applied when the collection is created, except the search-time options)
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_EF_SEARCH: Optional[int] = None
+    QDRANT_QUANTIZATION: str = "none" # none, scalar or binary
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    QDRANT_QUANTIZATION_RESCORE: bool = True
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0
+    QDRANT_VECTORS_ON_DISK: bool = False
+    QDRANT_PAYLOAD_ON_DISK: bool = False
 
     # VDB SETTINGS
+    VDB_BACKEND: str = "qdrant" # qdrant or numpy
+    NUMPY_VDB_PATH: str = "" # directory the numpy vdb is persisted to, empty keeps it in memory only
+    NUMPY_VDB_SNAPSHOT_PATH: str = "" # snapshot loaded on startup when NUMPY_VDB_PATH holds no saved store
+    NUMPY_VDB_INITIAL_CAPACITY: int = 1024
+    NUMPY_VDB_COMPACTION_RATIO: float = 0.25
     COLLECTION_NAME: str = "safe-speak"
     EMBEDDING_DIM: int = 768
+    EMBEDDING_BACKEND: str = "gemini" # gemini or hashing (local, no network)
+    # "global" searches every stored threat, "user" or "conversation" only the threats of the sender's user/conversation
+    VDB_SEARCH_SCOPE: str = "global"
+    EMBEDDING_CACHE_MAX_SIZE: int = 4096
+    EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT: float = 0.01
 
     # OAUTH CONFIGURATION
     OAUTH_PROVIDERS: List[str] = ["google"]
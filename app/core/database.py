@@ -1,12 +1,46 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def get_async_database_url() -> str:
+    """
+    Resolve the asyncpg url, derived from DATABASE_URL when ASYNC_DATABASE_URL is not set.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if settings.DATABASE_URL.startswith(prefix):
+            return "postgresql+asyncpg://" + settings.DATABASE_URL[len(prefix):]
+    return settings.DATABASE_URL
+
+
+# Sync engine, kept for Alembic and scripts
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine, used by the API
+async_engine = create_async_engine(
+    get_async_database_url(),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency to get the database session
@@ -15,4 +49,39 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get the async database session
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Short-lived unit of work, the connection goes back to the pool as soon as the block exits.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _get_pool_status(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+def get_pool_status() -> dict:
+    """
+    Current occupancy of the sync and async connection pools.
+    """
+    return {
+        "sync_pool": _get_pool_status(engine.pool),
+        "async_pool": _get_pool_status(async_engine.pool),
+    }
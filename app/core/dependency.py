@@ -1,4 +1,4 @@
-from fastapi import Request, Depends
+from fastapi import FastAPI, Request, Depends
 from jose import JWTError
 
 from app.core.security import decode_token
@@ -7,8 +7,12 @@ from app.infrastructures.protection_agent.provider import ProtectionAgentProvide
 from app.infrastructures.adversary.provider import AdversaryAgentProvider
 from app.infrastructures.protection_agent.base import ProtectionAgentBase
 from app.infrastructures.adversary.base import AdversaryBase
-from app.infrastructures.vdb.qdrant_vdb import QdrantVDB
+from app.infrastructures.vdb.base import VectorDBBase
+from app.infrastructures.vdb.provider import VectorDBProvider
+from app.services.vdb_outbox_worker import VdbOutboxWorker
+from app.core.config import settings
 from app.schemas.message_schema import MessageCreate
+from app.utils.worker_pool import BoundedWorkerPool
 
 async def get_user_id(
     request: Request
@@ -54,9 +58,57 @@ async def get_adversary_agent(
         raise NotFoundException(detail=str(e))
 
 
-def initialize_dependencies():
-    qdrant_vdb = QdrantVDB()
-    qdrant_vdb.initialize()
-    qdrant_vdb.close()
+async def get_vdb(
+    request: Request
+) -> VectorDBBase:
+    return request.app.state.vdb
+
+
+async def get_verdict_worker_pool(
+    request: Request
+) -> BoundedWorkerPool:
+    return request.app.state.verdict_worker_pool
+
+
+async def get_title_worker_pool(
+    request: Request
+) -> BoundedWorkerPool:
+    return request.app.state.title_worker_pool
+
+
+def initialize_dependencies(app: FastAPI):
+    """
+    Create the process-wide dependencies once, they live on app.state until shutdown.
+    """
+    vdb = VectorDBProvider().get_vdb(settings.VDB_BACKEND)
+    vdb.initialize()
+    app.state.vdb = vdb
+
+    app.state.vdb_outbox_worker = VdbOutboxWorker(vdb)
+    app.state.vdb_outbox_worker.start()
+
+    app.state.verdict_worker_pool = BoundedWorkerPool(
+        "Deferred verdict",
+        max_workers=settings.DEFERRED_VERDICT_WORKERS,
+        max_queue_size=settings.DEFERRED_VERDICT_QUEUE_SIZE
+    )
+    app.state.verdict_worker_pool.start()
+
+    app.state.title_worker_pool = BoundedWorkerPool(
+        "Title",
+        max_workers=settings.TITLE_WORKERS,
+        max_queue_size=settings.TITLE_QUEUE_SIZE
+    )
+    app.state.title_worker_pool.start()
+
+    ProtectionAgentProvider().build_agents()
+    AdversaryAgentProvider().build_agents()
+
+
+async def close_dependencies(app: FastAPI):
+    await app.state.verdict_worker_pool.stop()
+    await app.state.title_worker_pool.stop()
+    await app.state.vdb_outbox_worker.stop()
+    await app.state.vdb.aclose()
     
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterator
+from typing import Iterator, AsyncIterator
 import textwrap
 
 
@@ -43,10 +43,17 @@ class AdversaryBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def arespond(self, message: str, conversation: str) -> AsyncIterator[str]:
+        """
+        Async counterpart of respond, generate a stream of responses without blocking the event loop.
+        """
+        pass
+
     @abstractmethod
     def heartbeat(self) -> bool:
         """
         Check if the agent is alive.
         """
         pass
-        
\ No newline at end of file
+        
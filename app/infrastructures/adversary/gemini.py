@@ -1,12 +1,12 @@
 from .base import AdversaryBase
-from typing import Iterator
-from google import genai
+from typing import Iterator, AsyncIterator
+from app.infrastructures.genai_client import get_genai_client
 
 
 class GeminiAdversary(AdversaryBase):
     def __init__(self, name: str, persona: str, api_key: str):
         super().__init__(name=name, persona=persona)
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client(api_key)
         self.model = 'gemini-2.0-flash'
 
     def respond(self, message, conversation) -> Iterator[str]:
@@ -19,6 +19,16 @@ class GeminiAdversary(AdversaryBase):
         for chunk in response:
             yield chunk.text
 
+    async def arespond(self, message, conversation) -> AsyncIterator[str]:
+        system_prompt = self.get_attack_prompt(conversation, message)
+        response = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=system_prompt
+        )
+
+        async for chunk in response:
+            yield chunk.text
+
     def heartbeat(self) -> bool:
         try:
             self.client.models.generate_content(
@@ -6,6 +6,9 @@ from .persona import JULIA_PERSONA, LUCAS_PERSONA, PX_4
 
 
 class AdversaryAgentProvider:
+    # agents are stateless, one instance per persona is shared by every request
+    _instances: Dict[str, AdversaryBase] = {}
+
     def __init__(self):
         self._agents: Dict[str, Type[AdversaryBase]] = {
             "julia": self._create_julia_agent,
@@ -14,10 +17,21 @@ class AdversaryAgentProvider:
         }
     
     def get_agent(self, agent_name: str) -> AdversaryBase:
+        agent = self._instances.get(agent_name)
+        if agent:
+            return agent
+
         agent_class = self._agents.get(agent_name)
         if not agent_class:
             raise ValueError(f"Unknown protection agent: {agent_name}")
-        return agent_class() 
+        return self._instances.setdefault(agent_name, agent_class())
+
+    def build_agents(self):
+        """
+        Build every agent ahead of the first request.
+        """
+        for agent_name in self._agents:
+            self.get_agent(agent_name)
     
     def _create_gemini_agent(self, name: str, persona: str) -> AdversaryBase:
         return GeminiAdversary(name=name, persona=persona, api_key=settings.GEMINI_API_KEY)
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from asyncio import to_thread
+from typing import List
+
+from app.core.config import settings
+
+
+class EmbeddingBase(ABC):
+    """
+    Base class for embedding backends.
+    """
+
+    # local backends are cheap enough to skip the cross-request batcher
+    is_remote = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self.dim = settings.EMBEDDING_DIM
+
+    @abstractmethod
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Return one EMBEDDING_DIM vector per text, in the same order.
+        """
+        pass
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        return await to_thread(self.embed_texts, texts)
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.infrastructures.embedding.provider import get_embedding_backend
+from app.utils.micro_batcher import MicroBatcher
+
+
+_embedding_batcher: Optional[MicroBatcher] = None
+
+
+def get_embedding_batcher() -> MicroBatcher:
+    """
+    Process-wide embedding batcher shared by every request, concurrent embedding requests
+    are sent to the backend as a single call.
+    """
+    global _embedding_batcher
+
+    if _embedding_batcher is None:
+        _embedding_batcher = MicroBatcher(
+            get_embedding_backend().aembed_texts,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait=settings.EMBEDDING_BATCH_MAX_WAIT
+        )
+
+    return _embedding_batcher
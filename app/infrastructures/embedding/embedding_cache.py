@@ -0,0 +1,68 @@
+from typing import List
+import hashlib
+
+from app.core.config import settings
+from app.infrastructures.embedding.provider import get_embedding_backend
+from app.infrastructures.embedding.batcher import get_embedding_batcher
+from app.utils.cache import LRUCache
+
+
+embedding_cache = LRUCache(
+    max_size=settings.EMBEDDING_CACHE_MAX_SIZE,
+    ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS
+)
+
+
+def get_embedding_cache_key(text: str, model: str, dim: int = settings.EMBEDDING_DIM) -> str:
+    return hashlib.sha256(f"{model}:{dim}:{text}".encode("utf-8")).hexdigest()
+
+
+def embed_text_cached(text: str) -> List[float]:
+    """
+    Embed a single text, reusing the vector if the same text was embedded recently
+    (e.g. the RAG search and the threat insertion of the same message).
+    """
+    embedding_backend = get_embedding_backend()
+    key = get_embedding_cache_key(text, embedding_backend.model)
+    embedding = embedding_cache.get(key)
+    if embedding is None:
+        embedding = embedding_backend.embed_texts([text])[0]
+        embedding_cache.set(key, embedding)
+
+    return embedding
+
+
+async def aembed_text_cached(text: str) -> List[float]:
+    """
+    Async variant of embed_text_cached. Cache misses of remote backends go through the embedding
+    batcher so that concurrent requests share a single embedding call.
+    """
+    embedding_backend = get_embedding_backend()
+    key = get_embedding_cache_key(text, embedding_backend.model)
+    embedding = embedding_cache.get(key)
+    if embedding is None:
+        if embedding_backend.is_remote:
+            embedding = await get_embedding_batcher().submit(text)
+        else:
+            embedding = embedding_backend.embed_texts([text])[0]
+        embedding_cache.set(key, embedding)
+
+    return embedding
+
+
+async def aembed_texts_cached(texts: List[str]) -> List[List[float]]:
+    """
+    Embed several texts, only the ones missing from the cache are sent to the backend, in a single call.
+    """
+    embedding_backend = get_embedding_backend()
+    keys = [get_embedding_cache_key(text, embedding_backend.model) for text in texts]
+    embeddings = [embedding_cache.get(key) for key in keys]
+
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        missing_embeddings = await embedding_backend.aembed_texts([texts[i] for i in missing])
+        for i, embedding in zip(missing, missing_embeddings):
+            embeddings[i] = embedding
+            embedding_cache.set(keys[i], embedding)
+
+    return embeddings
@@ -1,17 +1,31 @@
-from google import genai
 from google.genai import types
 from typing import List
-from app.core.config import settings
+from app.infrastructures.genai_client import get_genai_client
+from .base import EmbeddingBase
 
 
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+class GeminiEmbedding(EmbeddingBase):
+    def __init__(self, api_key: str):
+        super().__init__(model="gemini-embedding-exp-03-07")
+        self.client = get_genai_client(api_key)
 
+    def _embed_content_config(self) -> types.EmbedContentConfig:
+        return types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY", output_dimensionality=self.dim)
 
-def embed_texts(texts: List[str]) -> List[float]:
-    result = client.models.embed_content(
-            model="gemini-embedding-exp-03-07",
-            contents=texts,
-            config=types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY", output_dimensionality=settings.EMBEDDING_DIM)
-    )
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        result = self.client.models.embed_content(
+                model=self.model,
+                contents=texts,
+                config=self._embed_content_config()
+        )
 
-    return result.embeddings[0].values
\ No newline at end of file
+        return [embedding.values for embedding in result.embeddings]
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        result = await self.client.aio.models.embed_content(
+                model=self.model,
+                contents=texts,
+                config=self._embed_content_config()
+        )
+
+        return [embedding.values for embedding in result.embeddings]
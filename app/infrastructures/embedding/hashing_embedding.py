@@ -0,0 +1,51 @@
+from typing import List, Sequence
+import re
+import numpy as np
+
+from .base import EmbeddingBase
+
+
+class HashingEmbedding(EmbeddingBase):
+    """
+    Network-free embedder. Character n-grams of the normalized text are hashed into
+    EMBEDDING_DIM signed buckets (the hashing trick) and the counts are L2-normalized, so
+    near-duplicate texts get a cosine similarity close to 1. Deterministic across processes.
+    """
+
+    is_remote = False
+
+    def __init__(self, ngram_sizes: Sequence[int] = (3, 4, 5)):
+        super().__init__(model=f"hashing-char-{min(ngram_sizes)}-{max(ngram_sizes)}")
+        self.ngram_sizes = tuple(ngram_sizes)
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self._embed(text)
+
+        return vectors
+
+    def _embed(self, text: str) -> np.ndarray:
+        normalized = " " + re.sub(r"\s+", " ", text).strip().casefold() + " "
+        codes = np.frombuffer(normalized.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for n in self.ngram_sizes:
+            if len(codes) < n:
+                continue
+
+            # FNV-1a over every window of n bytes at once
+            windows = np.lib.stride_tricks.sliding_window_view(codes, n)
+            hashes = np.full(len(windows), 2166136261, dtype=np.uint64)
+            for j in range(n):
+                hashes = ((hashes ^ windows[:, j]) * np.uint64(16777619)) & np.uint64(0xFFFFFFFF)
+
+            buckets = (hashes % np.uint64(self.dim)).astype(np.int64)
+            signs = np.where((hashes >> np.uint64(31)) & np.uint64(1), -1.0, 1.0).astype(np.float32)
+            vector += np.bincount(buckets, weights=signs, minlength=self.dim).astype(np.float32)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
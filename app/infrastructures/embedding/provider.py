@@ -0,0 +1,37 @@
+from typing import Callable, Dict, Optional
+from app.infrastructures.embedding.base import EmbeddingBase
+from app.infrastructures.embedding.gemini_embedding import GeminiEmbedding
+from app.infrastructures.embedding.hashing_embedding import HashingEmbedding
+from app.core.config import settings
+
+
+class EmbeddingProvider:
+    def __init__(self):
+        self._backends: Dict[str, Callable[[], EmbeddingBase]] = {
+            "gemini": self._create_gemini_backend,
+            "hashing": HashingEmbedding,
+        }
+
+    def get_backend(self, backend_name: str) -> EmbeddingBase:
+        backend_class = self._backends.get(backend_name)
+        if not backend_class:
+            raise ValueError(f"Unknown embedding backend: {backend_name}")
+        return backend_class()
+
+    def _create_gemini_backend(self) -> EmbeddingBase:
+        return GeminiEmbedding(api_key=settings.GEMINI_API_KEY)
+
+
+_embedding_backend: Optional[EmbeddingBase] = None
+
+
+def get_embedding_backend() -> EmbeddingBase:
+    """
+    Process-wide embedding backend selected by EMBEDDING_BACKEND.
+    """
+    global _embedding_backend
+
+    if _embedding_backend is None:
+        _embedding_backend = EmbeddingProvider().get_backend(settings.EMBEDDING_BACKEND)
+
+    return _embedding_backend
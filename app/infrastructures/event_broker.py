@@ -0,0 +1,47 @@
+from typing import Dict, Set
+import asyncio
+
+from app.core.config import settings
+
+
+class EventBroker:
+    """
+    In-process per-user event channels. Every open event stream of a user gets its own bounded
+    queue; events for a slow subscriber are dropped rather than blocking the publisher.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.setdefault(str(user_id), set()).add(queue)
+
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(str(user_id))
+        if subscribers is None:
+            return
+
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[str(user_id)]
+
+    def publish(self, user_id: str, event: str) -> int:
+        """
+        Send an event to every stream of the user, returns the number of streams reached.
+        """
+        delivered = 0
+        for queue in self._subscribers.get(str(user_id), ()):
+            try:
+                queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                print(f"Dropping event for a slow subscriber of user {user_id}")
+
+        return delivered
+
+
+event_broker = EventBroker(max_queue_size=settings.EVENT_STREAM_QUEUE_SIZE)
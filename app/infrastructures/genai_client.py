@@ -0,0 +1,17 @@
+from typing import Dict
+from google import genai
+
+
+_genai_clients: Dict[str, genai.Client] = {}
+
+
+def get_genai_client(api_key: str) -> genai.Client:
+    """
+    Process-wide GenAI client per API key, shared by the agents and the embedding backend
+    so that they reuse the same connection pool.
+    """
+    client = _genai_clients.get(api_key)
+    if client is None:
+        client = _genai_clients.setdefault(api_key, genai.Client(api_key=api_key))
+
+    return client
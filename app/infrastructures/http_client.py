@@ -0,0 +1,34 @@
+from typing import Optional
+import httpx
+
+from app.core.config import settings
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled async HTTP client for outbound calls (image downloads, image description API).
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT),
+            follow_redirects=True
+        )
+
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional
+import asyncio
+
+from app.core.config import settings
+from app.schemas.protection_schema import ProtectionResponse
+from app.infrastructures.protection_agent.base import ProtectionAgentBase
+from app.utils.micro_batcher import MicroBatcher
+
+
+class BatchingProtectionEngine:
+    """
+    Groups the verdict requests of concurrent conversations into a single structured-output
+    call of the protection agent. A batch that fails or comes back without some of its
+    verdicts falls back to one call per missing verdict.
+
+    A batch mixes tenants: conversations of different users are sent to the model in the same
+    prompt. Each request is JSON-encoded so that message text cannot forge another request,
+    but deployments that must keep users' conversations in separate model calls should leave
+    PROTECTION_BATCH_ENABLED off.
+    """
+
+    def __init__(self, protection_agent: ProtectionAgentBase, max_batch_size: int = 8, max_wait: float = 0.05):
+        self.protection_agent = protection_agent
+        self.batcher = MicroBatcher(self._process_batch, max_batch_size=max_batch_size, max_wait=max_wait)
+        self.batches = 0
+        self.batched_verdicts = 0
+        self.fallback_verdicts = 0
+
+    async def aprocess_content(self, content: str) -> ProtectionResponse:
+        # image analysis and prompt building stay per request, only the verdict call is shared
+        return await self.batcher.submit(content)
+
+    async def _process_batch(self, contents: List[str]) -> List[ProtectionResponse]:
+        if len(contents) == 1:
+            return [await self.protection_agent.aprocess_content(contents[0])]
+
+        self.batches += 1
+        try:
+            verdicts = await self.protection_agent.aprocess_contents_batch(contents)
+        except Exception as e:
+            print(f"Batched verdict of {len(contents)} requests failed, falling back to single calls: {e}")
+            verdicts = [None] * len(contents)
+
+        missing = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        self.batched_verdicts += len(contents) - len(missing)
+        self.fallback_verdicts += len(missing)
+
+        if missing:
+            single_verdicts = await asyncio.gather(
+                *(self.protection_agent.aprocess_content(contents[i]) for i in missing),
+                return_exceptions=True
+            )
+            for i, verdict in zip(missing, single_verdicts):
+                verdicts[i] = verdict
+
+        return verdicts
+
+
+_engines: Dict[str, BatchingProtectionEngine] = {}
+
+
+def get_batching_engine(protection_agent: ProtectionAgentBase) -> Optional[BatchingProtectionEngine]:
+    """
+    Process-wide batching engine of an agent, None when batching is disabled.
+    """
+    if not settings.PROTECTION_BATCH_ENABLED:
+        return None
+
+    engine = _engines.get(protection_agent.name)
+    if engine is None:
+        engine = _engines.setdefault(protection_agent.name, BatchingProtectionEngine(
+            protection_agent,
+            max_batch_size=settings.PROTECTION_BATCH_MAX_SIZE,
+            max_wait=settings.PROTECTION_BATCH_MAX_WAIT
+        ))
+
+    return engine
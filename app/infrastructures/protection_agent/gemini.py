@@ -1,62 +1,72 @@
 from .base import ProtectionAgentBase
-from app.schemas.protection_schema import ProtectionResponse
-from google import genai
+from .images import extract_image_urls
+from app.schemas.protection_schema import ProtectionResponse, ProtectionBatchItem
+from app.infrastructures.genai_client import get_genai_client
 from google.genai import types
 
+from typing import List, Optional
+import json
 import textwrap
 
 
 class GeminiProtectionAgent(ProtectionAgentBase):
     def __init__(self, name: str, api_key: str):
         super().__init__(name=name)
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client(api_key)
         self.model = 'gemini-2.0-flash'
         self.tool_calling_prompt = textwrap.dedent("""
             Use the appropriate tool functions based on the given message below.
-            If there are image urls, pick one of them and use the analyze_image_api to analyze the content of the image.
+            If there are image urls, use the analyze_image_api on each of them to analyze the content of the images.
             Message: {message}
         """)
 
     def process_message(self, message, conversation, relevant_messages: str=None) -> ProtectionResponse:
-        system_prompt = self.get_system_prompt(conversation, message)
+        image_desc = self.analyze_images(self._select_image_urls(message))
+        content = self.build_verdict_content(message, conversation, relevant_messages, image_desc)
 
         response = self.client.models.generate_content(
             model=self.model,
-            contents=self.tool_calling_prompt.format(message=message),
-            config={
-                'tools': [types.Tool(function_declarations=[self.image_analysis_function_declaration()])]
-            }
+            contents=content,
+            config=self._verdict_config()
         )
 
-        tool_call = response.candidates[0].content.parts[0].function_call
-
-        image_desc = None
-        if tool_call and tool_call.name == "analyze_image_api":
-            image_desc = self.analyze_image_api(**tool_call.args)
-            print(image_desc)
+        return response.parsed
 
-        content = system_prompt if not image_desc else f"{system_prompt}\n{image_desc}"
+    async def aprocess_message(self, message, conversation, relevant_messages: str=None) -> ProtectionResponse:
+        return await self.aprocess_content(await self.aprepare_verdict_content(message, conversation, relevant_messages))
 
-        if relevant_messages and relevant_messages != "":
-            content += f"\n\n{relevant_messages}"
+    async def aprocess_content(self, content: str) -> ProtectionResponse:
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=content,
+            config=self._verdict_config()
+        )
 
-        print(f"{content}")
+        return response.parsed
 
-        response = self.client.models.generate_content(
+    async def aprocess_contents_batch(self, contents: List[str]) -> List[Optional[ProtectionResponse]]:
+        response = await self.client.aio.models.generate_content(
             model=self.model,
-            contents=content,
+            contents=self._build_batch_verdict_content(contents),
             config={
                 'response_mime_type': 'application/json',
-                'response_schema': ProtectionResponse,
+                'response_schema': list[ProtectionBatchItem],
             }
         )
 
-        return response.parsed
+        return self._demultiplex_batch_verdicts(response.parsed, len(contents))
     
     def generate_conversation_title(self, user_prompt):
         title = self.client.models.generate_content(
             model=self.model,
-            contents=f"Generate a single descriptive conversation title based on the following user prompt:\nUser: {user_prompt}\nRETURN THE TITLE ONLY!"
+            contents=self._title_prompt(user_prompt)
+        )
+        return title.text
+
+    async def agenerate_conversation_title(self, user_prompt):
+        title = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=self._title_prompt(user_prompt)
         )
         return title.text
     
@@ -86,3 +96,62 @@ class GeminiProtectionAgent(ProtectionAgentBase):
         except Exception as e:
             print(f"Gemini heartbeat failed: {e}")
             return False
+
+    def _select_image_urls(self, message: str) -> List[str]:
+        """
+        Pick the images to analyze locally, only asking the model when the message
+        has links that may or may not be images.
+        """
+        extraction = extract_image_urls(message)
+        if extraction.image_urls or not extraction.ambiguous_urls:
+            return extraction.image_urls
+
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=self.tool_calling_prompt.format(message=message),
+            config=self._tool_calling_config()
+        )
+        return self._get_tool_call_image_urls(response)
+
+    async def aselect_image_urls(self, message: str) -> List[str]:
+        extraction = extract_image_urls(message)
+        if extraction.image_urls or not extraction.ambiguous_urls:
+            return extraction.image_urls
+
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=self.tool_calling_prompt.format(message=message),
+            config=self._tool_calling_config()
+        )
+        return self._get_tool_call_image_urls(response)
+
+    def _get_tool_call_image_urls(self, response) -> List[str]:
+        return [
+            part.function_call.args["img_url"]
+            for part in response.candidates[0].content.parts
+            if part.function_call and part.function_call.name == "analyze_image_api"
+        ]
+
+    def _tool_calling_config(self):
+        return {
+            'tools': [types.Tool(function_declarations=[self.image_analysis_function_declaration()])]
+        }
+
+    def _verdict_config(self):
+        return {
+            'response_mime_type': 'application/json',
+            'response_schema': ProtectionResponse,
+        }
+
+    def _build_batch_verdict_content(self, contents: List[str]) -> str:
+        # every request is a JSON string, text inside a request cannot open or close another one
+        requests = json.dumps(
+            [{"index": index, "request": content} for index, content in enumerate(contents)],
+            ensure_ascii=False,
+            indent=1
+        )
+
+        return self.batch_verdict_prompt.format(count=len(contents), requests=requests)
+
+    def _title_prompt(self, user_prompt: str) -> str:
+        return f"Generate a single descriptive conversation title based on the following user prompt:\nUser: {user_prompt}\nRETURN THE TITLE ONLY!"
@@ -0,0 +1,136 @@
+import re
+from typing import Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+from app.schemas.protection_schema import PreFilterResult
+
+
+CONFIDENT_MALICIOUS = "confident-malicious"
+UNCERTAIN = "uncertain"
+
+
+URL_PATTERN = re.compile(r"\b(?:https?://|www\.)[^\s<>()\[\]\"']+", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_PATTERN = re.compile(r"(?<!\w)(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?!\w)")
+SSN_PATTERN = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+CARD_PATTERN = re.compile(r"\b(?:\d[ -]?){13,16}\b")
+IP_HOST_PATTERN = re.compile(r"^\d{1,3}(?:\.\d{1,3}){3}$")
+EXECUTABLE_PATTERN = re.compile(r"\w\.(?:exe|apk|scr|bat|msi|jar)\b", re.IGNORECASE)
+
+URL_SHORTENERS = frozenset({
+    "bit.ly", "tinyurl.com", "t.co", "goo.gl", "ow.ly", "is.gd", "buff.ly", "cutt.ly", "rb.gy", "shorturl.at",
+})
+
+SUSPICIOUS_TLDS = frozenset({
+    "zip", "mov", "xyz", "top", "tk", "ml", "ga", "cf", "gq", "click", "country", "kim", "work", "loan",
+})
+
+KNOWN_PHISHING_DOMAINS = frozenset({
+    "paypal-security-check.com", "appleid-verify.com", "secure-bankofamerica-login.com", "amazon-account-update.com",
+    "netflix-billing-update.com", "microsoft-support-alert.com", "wallet-connect-validate.com", "metamask-restore.io",
+})
+
+# weights of terms commonly found in scams, phishing, threats and abuse
+LEXICON = {
+    "bitcoin": 2.0, "crypto wallet": 2.5, "seed phrase": 4.0, "gift card": 3.0, "wire transfer": 2.5, "western union": 3.0,
+    "send money": 2.5, "bank account": 2.0, "routing number": 3.0, "social security": 3.0, "password": 2.0,
+    "verify your account": 3.5, "account suspended": 3.5, "confirm your identity": 3.0, "login details": 3.0,
+    "one-time code": 3.0, "otp": 2.0, "urgent": 1.5, "act now": 2.0, "limited time": 1.5, "you have won": 3.5,
+    "lottery": 2.5, "prize": 1.5, "inheritance": 2.5, "investment opportunity": 2.5, "guaranteed return": 3.0,
+    "click here": 2.0, "click the link": 2.0, "download": 1.0,
+    "kill": 3.0, "hurt you": 3.5, "kill yourself": 6.0, "suicide": 3.0, "bomb": 3.0, "weapon": 2.0,
+    "stupid": 1.5, "idiot": 2.0, "worthless": 2.5, "hate you": 2.5, "nude": 3.0, "naked": 2.5, "sex": 2.0,
+    "don't tell anyone": 3.0, "keep this between us": 3.0, "home address": 2.5, "where do you live": 2.5,
+}
+LEXICON_PATTERN = re.compile(
+    r"(?<!\w)(?:" + "|".join(re.escape(term) for term in sorted(LEXICON, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE
+)
+
+
+# the lexicon and the weak signals (contact details, ordinary links) can only make a message
+# uncertain, words like "kill" or "bomb" are as common in games and jokes as in threats
+WEAK_SCORE_CAP = 4.0
+
+
+class HeuristicPreFilter:
+    """
+    Local first-stage classifier. It scores URLs, contact details, PII, known phishing domains and
+    a weighted lexicon in microseconds, and short-circuits only the confidently malicious messages.
+
+    Only strong indicators (known phishing domains, links to executables, social security and
+    payment card numbers) count towards malicious_threshold. The weak signals are capped at
+    WEAK_SCORE_CAP and only reported. A low score is not evidence that a message is benign, so
+    everything below the threshold is left to the protection agent.
+    """
+
+    def __init__(
+        self,
+        malicious_threshold: float = 10.0,
+        extra_phishing_domains: Iterable[str] = ()
+    ):
+        self.malicious_threshold = malicious_threshold
+        self.phishing_domains = KNOWN_PHISHING_DOMAINS | {domain.lower() for domain in extra_phishing_domains}
+
+    def classify(self, message: str) -> PreFilterResult:
+        strong_score = 0.0
+        weak_score = 0.0
+        reasons: List[str] = []
+
+        for url in URL_PATTERN.findall(message):
+            url_score, url_reason, is_strong = self._score_url(url)
+            if is_strong:
+                strong_score += url_score
+            else:
+                weak_score += url_score
+            reasons.append(url_reason)
+
+        text_without_urls = URL_PATTERN.sub(" ", message)
+
+        if SSN_PATTERN.search(text_without_urls):
+            strong_score += 6.0
+            reasons.append("a social security number")
+        elif CARD_PATTERN.search(text_without_urls):
+            strong_score += 6.0
+            reasons.append("a payment card number")
+        elif PHONE_PATTERN.search(text_without_urls):
+            weak_score += 1.5
+            reasons.append("a phone number")
+
+        if EXECUTABLE_PATTERN.search(text_without_urls):
+            weak_score += 1.0
+            reasons.append("an executable file name")
+
+        if EMAIL_PATTERN.search(text_without_urls):
+            weak_score += 1.0
+            reasons.append("an email address")
+
+        matched_terms = {match.lower() for match in LEXICON_PATTERN.findall(text_without_urls)}
+        for term in sorted(matched_terms):
+            weak_score += LEXICON[term]
+            reasons.append(f'the term "{term}"')
+
+        verdict = CONFIDENT_MALICIOUS if strong_score >= self.malicious_threshold else UNCERTAIN
+
+        return PreFilterResult(verdict=verdict, score=strong_score + min(weak_score, WEAK_SCORE_CAP), reasons=reasons)
+
+    def _score_url(self, url: str) -> Tuple[float, str, bool]:
+        """
+        Score, reason and whether the link is a strong indicator.
+        """
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        host = (parts.hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        if host in self.phishing_domains or any(host.endswith(f".{domain}") for domain in self.phishing_domains):
+            return 10.0, f"a link to the known phishing domain {host}", True
+        if EXECUTABLE_PATTERN.search(parts.path):
+            return 6.0, f"a link to an executable file ({host})", True
+        if IP_HOST_PATTERN.match(host):
+            return 3.0, f"a link to a raw IP address ({host})", False
+        if host in URL_SHORTENERS:
+            return 2.0, f"a shortened link ({host})", False
+        if host.rsplit(".", 1)[-1] in SUSPICIOUS_TLDS:
+            return 2.0, f"a link with a suspicious domain ({host})", False
+        return 0.5, f"a link ({host})", False
@@ -0,0 +1,64 @@
+import re
+from typing import List
+from urllib.parse import urlsplit
+
+from app.schemas.protection_schema import ImageExtractionResult
+
+
+MARKDOWN_IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\(\s*<?([^\s)>]+)>?(?:\s+[\"'][^\"']*[\"'])?\s*\)")
+HTML_IMAGE_PATTERN = re.compile(r"<img\b[^>]*\bsrc\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+URL_PATTERN = re.compile(r"\bhttps?://[^\s<>()\[\]\"']+", re.IGNORECASE)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg", ".avif", ".heic", ".tif", ".tiff", ".ico")
+NON_IMAGE_EXTENSIONS = (
+    ".html", ".htm", ".php", ".asp", ".aspx", ".jsp", ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".zip", ".rar",
+    ".exe", ".apk", ".mp3", ".mp4", ".mov", ".js", ".css", ".txt", ".json", ".xml",
+)
+IMAGE_HOSTS = frozenset({
+    "i.imgur.com", "i.ytimg.com", "pbs.twimg.com", "images.unsplash.com", "i.redd.it", "media.giphy.com",
+    "encrypted-tbn0.gstatic.com", "lh3.googleusercontent.com", "cdn.discordapp.com",
+})
+IMAGE_FORMAT_QUERY = re.compile(r"(?:^|&)(?:format|fm|ext)=(?:png|jpe?g|gif|webp|avif)\b", re.IGNORECASE)
+
+
+def extract_image_urls(message: str) -> ImageExtractionResult:
+    """
+    Deterministically find the images of a message. Markdown/HTML images and links that look like
+    images are returned as image_urls, bare links that may or may not serve an image as ambiguous_urls.
+    """
+    image_urls: List[str] = []
+    ambiguous_urls: List[str] = []
+
+    for url in MARKDOWN_IMAGE_PATTERN.findall(message) + HTML_IMAGE_PATTERN.findall(message):
+        if url.lower().startswith(("http://", "https://")) and url not in image_urls:
+            image_urls.append(url)
+
+    text_without_images = HTML_IMAGE_PATTERN.sub(" ", MARKDOWN_IMAGE_PATTERN.sub(" ", message))
+    for url in URL_PATTERN.findall(text_without_images):
+        url = url.rstrip(".,;:!?")
+        if url in image_urls or url in ambiguous_urls:
+            continue
+
+        kind = classify_url(url)
+        if kind == "image":
+            image_urls.append(url)
+        elif kind == "unknown":
+            ambiguous_urls.append(url)
+
+    return ImageExtractionResult(image_urls=image_urls, ambiguous_urls=ambiguous_urls)
+
+
+def classify_url(url: str) -> str:
+    """
+    Classify a link as "image", "non-image" or "unknown" from its host, path and query.
+    """
+    parts = urlsplit(url)
+    path = parts.path.lower()
+
+    if path.endswith(IMAGE_EXTENSIONS) or IMAGE_FORMAT_QUERY.search(parts.query):
+        return "image"
+    if (parts.hostname or "").lower() in IMAGE_HOSTS:
+        return "image"
+    if path.endswith(NON_IMAGE_EXTENSIONS):
+        return "non-image"
+    return "unknown"
@@ -5,16 +5,30 @@ from app.core.config import settings
 
 
 class ProtectionAgentProvider:
+    # agents are stateless, one instance per agent name is shared by every request
+    _instances: Dict[str, ProtectionAgentBase] = {}
+
     def __init__(self):
         self._agents: Dict[str, Type[ProtectionAgentBase]] = {
             "gemini": self._create_gemini_agent,
         }
     
     def get_agent(self, agent_name: str) -> ProtectionAgentBase:
+        agent = self._instances.get(agent_name)
+        if agent:
+            return agent
+
         agent_class = self._agents.get(agent_name)
         if not agent_class:
             raise ValueError(f"Unknown protection agent: {agent_name}")
-        return agent_class() 
+        return self._instances.setdefault(agent_name, agent_class())
+
+    def build_agents(self):
+        """
+        Build every agent ahead of the first request.
+        """
+        for agent_name in self._agents:
+            self.get_agent(agent_name)
     
     def _create_gemini_agent(self) -> ProtectionAgentBase:
         return GeminiProtectionAgent(name="gemini", api_key=settings.GEMINI_API_KEY)
@@ -0,0 +1,118 @@
+import asyncio
+import re
+from typing import Optional
+
+from .base import ProtectionAgentBase
+from app.schemas.protection_schema import ProtectionResponse
+
+
+SENTENCE_BOUNDARY = re.compile(r"[.!?](\s|$)|\n")
+
+
+class StreamingVerdictMonitor:
+    """
+    Checks the accumulated adversary reply at checkpoints (sentence boundaries or every
+    N tokens) while it is still streaming. Only one check runs at a time, checkpoints
+    reached in the meantime are folded into the next check.
+    """
+
+    def __init__(
+        self,
+        protection_agent: ProtectionAgentBase,
+        conversation: str,
+        checkpoint: str = "sentence",
+        token_interval: int = 50,
+        min_chars: int = 40
+    ):
+        if checkpoint not in ("sentence", "tokens"):
+            raise ValueError(f"Unknown streaming protection checkpoint: {checkpoint}")
+
+        self.protection_agent = protection_agent
+        self.conversation = conversation
+        self.checkpoint = checkpoint
+        self.token_interval = token_interval
+        self.min_chars = min_chars
+
+        self.text = ""
+        self.verdict: Optional[ProtectionResponse] = None
+        self.checked_text = ""
+        self._unchecked = ""
+        self._checkpoint_reached = False
+        self._check_task: Optional[asyncio.Task] = None
+        self._check_task_text = ""
+
+    def feed(self, chunk: str):
+        """
+        Append a streamed chunk and start a check if a checkpoint has been reached.
+        """
+        self.text += chunk
+        self._unchecked += chunk
+
+        if self._is_checkpoint():
+            self._checkpoint_reached = True
+            self._unchecked = ""
+
+        self._start_check()
+
+    def poll(self) -> Optional[ProtectionResponse]:
+        """
+        Return the verdict of the check that finished since the last poll, if any.
+        """
+        if not self._check_task or not self._check_task.done():
+            return None
+
+        task, self._check_task = self._check_task, None
+        checked_text = self._check_task_text
+        self._start_check()
+
+        try:
+            verdict = task.result()
+        except Exception as e:
+            print(f"Streaming protection check failed: {e}")
+            return None
+
+        self.verdict = verdict
+        self.checked_text = checked_text
+        return verdict
+
+    async def finalize(self, text: str) -> Optional[ProtectionResponse]:
+        """
+        Verdict for the complete reply if a check already ran (or is running) on exactly
+        this text, so the final verdict does not need another call. Any other check is cancelled.
+        """
+        if self._check_task and self._check_task_text == text:
+            try:
+                await self._check_task
+            except Exception:
+                pass
+            self.poll()
+
+        await self.close()
+
+        if self.verdict is not None and self.checked_text == text:
+            return self.verdict
+        return None
+
+    async def close(self):
+        if self._check_task and not self._check_task.done():
+            self._check_task.cancel()
+            try:
+                await self._check_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._check_task = None
+
+    def _is_checkpoint(self) -> bool:
+        if self.checkpoint == "sentence":
+            return SENTENCE_BOUNDARY.search(self._unchecked) is not None
+        return len(self._unchecked.split()) >= self.token_interval
+
+    def _start_check(self):
+        if self._check_task or not self._checkpoint_reached or len(self.text) < self.min_chars:
+            return
+
+        self._checkpoint_reached = False
+        self._check_task_text = self.text
+        self._check_task = asyncio.create_task(
+            self.protection_agent.aprocess_message(self.text, self.conversation)
+        )
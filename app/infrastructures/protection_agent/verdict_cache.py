@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import re
+
+from app.core.config import settings
+from app.schemas.protection_schema import ProtectionResponse
+from app.utils.cache import LRUCache
+
+
+class VerdictCacheBackend(ABC):
+    """
+    Storage for cached verdicts. Shared backends (e.g. a key-value store reachable by every
+    worker) implement this interface and are registered with register_verdict_cache_backend.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: dict):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryVerdictCacheBackend(VerdictCacheBackend):
+    def __init__(self):
+        self.cache = LRUCache(
+            max_size=settings.VERDICT_CACHE_MAX_SIZE,
+            ttl_seconds=settings.VERDICT_CACHE_TTL_SECONDS
+        )
+
+    async def get(self, key):
+        return self.cache.get(key)
+
+    async def set(self, key, value):
+        self.cache.set(key, value)
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        return {"size": stats["size"], "max_size": stats["max_size"]}
+
+
+class VerdictCache:
+    """
+    Exact-match verdict cache keyed on a normalized hash of (message, guidelines, model),
+    optionally extended with a digest of the latest conversation lines.
+    """
+
+    def __init__(self, backend: VerdictCacheBackend, include_context: bool = False, context_lines: int = 4):
+        self.backend = backend
+        self.include_context = include_context
+        self.context_lines = context_lines
+        self.hits = 0
+        self.misses = 0
+
+    def build_key(self, message: str, guidelines: str, model: str, conversation: str = None) -> str:
+        parts = [self._normalize(message), self._normalize(guidelines), model or ""]
+        if self.include_context and conversation:
+            recent_lines = [line for line in conversation.splitlines() if line.strip()][-self.context_lines:]
+            parts.append(self._normalize("\n".join(recent_lines)))
+
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[ProtectionResponse]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            print(f"Verdict cache lookup failed: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return ProtectionResponse.model_validate(value)
+
+    async def set(self, key: str, verdict: ProtectionResponse):
+        try:
+            await self.backend.set(key, verdict.model_dump())
+        except Exception as e:
+            print(f"Verdict cache store failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.VERDICT_CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+    def _normalize(self, text: str) -> str:
+        return re.sub(r"\s+", " ", text or "").strip().casefold()
+
+
+_backends: Dict[str, Callable[[], VerdictCacheBackend]] = {
+    "memory": InMemoryVerdictCacheBackend,
+}
+
+_verdict_cache: Optional[VerdictCache] = None
+
+
+def register_verdict_cache_backend(name: str, factory: Callable[[], VerdictCacheBackend]):
+    """
+    Register a verdict cache backend selectable through VERDICT_CACHE_BACKEND.
+    """
+    _backends[name] = factory
+
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """
+    Process-wide verdict cache, None when the cache is disabled.
+    """
+    global _verdict_cache
+
+    if not settings.VERDICT_CACHE_ENABLED:
+        return None
+
+    if _verdict_cache is None:
+        backend_factory = _backends.get(settings.VERDICT_CACHE_BACKEND)
+        if not backend_factory:
+            raise ValueError(f"Unknown verdict cache backend: {settings.VERDICT_CACHE_BACKEND}")
+
+        _verdict_cache = VerdictCache(
+            backend_factory(),
+            include_context=settings.VERDICT_CACHE_INCLUDE_CONTEXT,
+            context_lines=settings.VERDICT_CACHE_CONTEXT_LINES
+        )
+
+    return _verdict_cache
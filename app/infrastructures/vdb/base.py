@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.schemas.vdb_schema import PointSchema
+from asyncio import to_thread
+from typing import Iterator, List, Optional, Sequence, Tuple
+from app.schemas.vdb_schema import PointSchema, PointPayloadSchema, SimilarPointSchema
 from app.core.config import settings
 
 
@@ -10,17 +11,85 @@ class VectorDBBase(ABC):
         self.collection_name = settings.COLLECTION_NAME
     
     @abstractmethod
-    def insert_point(self, message_content: str, message_id: str):
+    def insert_point(
+        self,
+        message_content: str,
+        message_id: str,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ):
         pass
 
     @abstractmethod
     def delete_points(self, message_id: str):
         pass
 
+    def delete_points_batch(self, message_ids: Sequence[str]):
+        for message_id in message_ids:
+            self.delete_points(message_id)
+
+    @abstractmethod
+    def search_similar(
+        self,
+        query: str,
+        k: int = 10,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> List[SimilarPointSchema]:
+        """
+        Return the k stored messages closest to the query, most similar first.
+        user_id and conversation_id restrict the search to the points of that user/conversation.
+        """
+        pass
+
+    async def asearch_similar(
+        self,
+        query: str,
+        k: int = 10,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> List[SimilarPointSchema]:
+        return await to_thread(self.search_similar, query, k, user_id, conversation_id)
+
+    def search_points(
+        self,
+        query: str,
+        k: int = 10,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> str:
+        return self.format_similar_points(self.search_similar(query, k, user_id, conversation_id))
+
     @abstractmethod
-    def search_points(self, query: str, k:int) -> str:
+    def add_vectors(self, vectors: Sequence[Sequence[float]], payloads: Sequence[PointPayloadSchema]):
+        """
+        Insert already embedded points, used by the VDB outbox worker and to load snapshots.
+        """
         pass
 
+    @abstractmethod
+    def iter_points(self, batch_size: int = 1024) -> Iterator[Tuple[List[List[float]], List[PointPayloadSchema]]]:
+        """
+        Yield every stored point as (vectors, payloads) batches, used to take snapshots.
+        """
+        pass
+
+    def flush(self):
+        """
+        Make the applied writes durable. Remote databases persist on write, so this is a no-op
+        unless the store keeps its points in process memory.
+        """
+        pass
+
+    @staticmethod
+    def format_similar_points(points: List[SimilarPointSchema]) -> str:
+        formatted_str = "SIMILAR MESSAGES WITH SIMILARITY SCORE:\n"
+
+        for i, point in enumerate(points):
+            formatted_str += f"{i + 1}. {point.content}\nSimilarity score: {point.score}\n\n"
+
+        return formatted_str
+
     @abstractmethod
     def initialize(self):
         pass
@@ -29,3 +98,6 @@ class VectorDBBase(ABC):
     def close(self):
         pass
 
+    async def aclose(self):
+        await to_thread(self.close)
+
@@ -0,0 +1,266 @@
+from .base import VectorDBBase
+from app.core.config import settings
+from app.schemas.vdb_schema import PointPayloadSchema, SimilarPointSchema
+from app.infrastructures.embedding.embedding_cache import embed_text_cached, aembed_text_cached
+from app.infrastructures.vdb.snapshot import ThreatSnapshot
+
+from asyncio import to_thread
+from typing import Dict, List, Optional, Sequence
+import json
+import os
+import threading
+import numpy as np
+
+
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.json"
+
+
+class NumpyVDB(VectorDBBase):
+    """
+    In-process vector store for single-node deployments, tests and benchmarks.
+
+    Vectors are kept normalized in a contiguous float32 matrix so that cosine similarity is a
+    single matrix-vector product. Deleted rows are tombstoned and the matrix is compacted once
+    they exceed NUMPY_VDB_COMPACTION_RATIO. When NUMPY_VDB_PATH is set the matrix is saved there
+    on close (and after every VDB outbox batch) and memory-mapped back on initialize.
+
+    The store belongs to a single process. Run one API worker with it, several processes would
+    each hold part of the threats and overwrite each other's files.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        self.path = settings.NUMPY_VDB_PATH if path is None else path
+        self.compaction_ratio = settings.NUMPY_VDB_COMPACTION_RATIO
+        self._lock = threading.RLock()
+        self._reset(settings.NUMPY_VDB_INITIAL_CAPACITY)
+
+    def _reset(self, capacity: int):
+        self._vectors = np.zeros((capacity, self.vec_dim), dtype=np.float32)
+        self._deleted = np.zeros(capacity, dtype=bool)
+        self._user_ids = np.empty(capacity, dtype=object)
+        self._conversation_ids = np.empty(capacity, dtype=object)
+        self._payloads: List[PointPayloadSchema] = []
+        self._rows_by_message_id: Dict[str, List[int]] = {}
+        self._size = 0
+        self._deleted_count = 0
+
+    def __len__(self) -> int:
+        return self._size - self._deleted_count
+
+    def insert_point(self, message_content, message_id, user_id=None, conversation_id=None):
+        self.add_vectors(
+            [embed_text_cached(message_content)],
+            [PointPayloadSchema(message_id=message_id, content=message_content, user_id=user_id, conversation_id=conversation_id)]
+        )
+
+    def add_vectors(self, vectors, payloads: Sequence[PointPayloadSchema]):
+        """
+        Insert already embedded points, vectors is an (n, EMBEDDING_DIM) array-like.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.vec_dim)
+        if len(vectors) != len(payloads):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(payloads)} payloads")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        with self._lock:
+            self._reserve(self._size + len(vectors))
+            start, end = self._size, self._size + len(vectors)
+            self._vectors[start:end] = vectors / norms
+            self._deleted[start:end] = False
+
+            for row, payload in enumerate(payloads, start=start):
+                # a message is stored once, re-inserting it replaces the previous row
+                for previous_row in self._rows_by_message_id.pop(payload.message_id, []):
+                    if not self._deleted[previous_row]:
+                        self._deleted[previous_row] = True
+                        self._deleted_count += 1
+
+                self._user_ids[row] = payload.user_id
+                self._conversation_ids[row] = payload.conversation_id
+                self._payloads.append(payload)
+                self._rows_by_message_id.setdefault(payload.message_id, []).append(row)
+
+            self._size = end
+
+    def iter_points(self, batch_size=1024):
+        with self._lock:
+            rows = np.flatnonzero(~self._deleted[:self._size])
+            vectors = self._vectors[rows]
+            payloads = [self._payloads[row] for row in rows]
+
+        for start in range(0, len(rows), batch_size):
+            yield vectors[start:start + batch_size], payloads[start:start + batch_size]
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(self._vectors):
+            return
+
+        new_capacity = max(capacity, len(self._vectors) * 2)
+        vectors = np.zeros((new_capacity, self.vec_dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        deleted = np.zeros(new_capacity, dtype=bool)
+        deleted[:self._size] = self._deleted[:self._size]
+        user_ids = np.empty(new_capacity, dtype=object)
+        user_ids[:self._size] = self._user_ids[:self._size]
+        conversation_ids = np.empty(new_capacity, dtype=object)
+        conversation_ids[:self._size] = self._conversation_ids[:self._size]
+
+        self._vectors, self._deleted = vectors, deleted
+        self._user_ids, self._conversation_ids = user_ids, conversation_ids
+
+    def delete_points(self, message_id):
+        with self._lock:
+            rows = self._rows_by_message_id.pop(message_id, [])
+            for row in rows:
+                if not self._deleted[row]:
+                    self._deleted[row] = True
+                    self._deleted_count += 1
+
+            if self._deleted_count and self._deleted_count >= self.compaction_ratio * self._size:
+                self.compact()
+
+        return len(rows)
+
+    def compact(self):
+        """
+        Drop the tombstoned rows and rebuild the row index.
+        """
+        with self._lock:
+            keep = np.flatnonzero(~self._deleted[:self._size])
+            vectors = self._vectors[keep]
+            payloads = [self._payloads[row] for row in keep]
+
+            self._reset(max(len(keep), settings.NUMPY_VDB_INITIAL_CAPACITY))
+            self.add_vectors(vectors, payloads)
+
+    def search_similar(self, query, k=10, user_id=None, conversation_id=None) -> List[SimilarPointSchema]:
+        return self.search_by_vector(embed_text_cached(query), k, user_id, conversation_id)
+
+    async def asearch_similar(self, query, k=10, user_id=None, conversation_id=None) -> List[SimilarPointSchema]:
+        embedding_query = await aembed_text_cached(query)
+        return await to_thread(self.search_by_vector, embedding_query, k, user_id, conversation_id)
+
+    def search_by_vector(
+        self,
+        vector,
+        k: int = 10,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> List[SimilarPointSchema]:
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm:
+            query = query / query_norm
+
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+
+            scores = self._vectors[:self._size] @ query
+            excluded = self._deleted[:self._size].copy()
+            if user_id is not None:
+                excluded |= self._user_ids[:self._size] != user_id
+            if conversation_id is not None:
+                excluded |= self._conversation_ids[:self._size] != conversation_id
+            scores[excluded] = -np.inf
+
+            k = min(k, self._size - int(excluded.sum()))
+            if k <= 0:
+                return []
+
+            top_rows = np.argpartition(-scores, k - 1)[:k]
+            top_rows = top_rows[np.argsort(-scores[top_rows])]
+
+            return [
+                SimilarPointSchema(
+                    message_id=self._payloads[row].message_id,
+                    content=self._payloads[row].content,
+                    score=float(scores[row])
+                )
+                for row in top_rows
+            ]
+
+    def initialize(self):
+        if not self.path:
+            print("NumPy VDB is running in memory only")
+            self._load_snapshot()
+            return
+
+        vectors_path = os.path.join(self.path, VECTORS_FILE)
+        payloads_path = os.path.join(self.path, PAYLOADS_FILE)
+        if not os.path.exists(vectors_path):
+            print(f"No NumPy VDB found in {self.path}")
+            self._load_snapshot()
+            return
+
+        # copy-on-write mapping, the pages are only read from disk when they are searched
+        vectors = np.load(vectors_path, mmap_mode="c")
+        if vectors.ndim != 2 or vectors.shape[1] != self.vec_dim:
+            raise ValueError(f"Stored vectors have shape {vectors.shape}, expected (n, {self.vec_dim})")
+
+        with open(payloads_path, "r", encoding="utf-8") as f:
+            payloads = [PointPayloadSchema.model_validate(payload) for payload in json.load(f)]
+
+        with self._lock:
+            self._reset(0)
+            self._vectors = vectors
+            self._deleted = np.zeros(len(vectors), dtype=bool)
+            self._user_ids = np.array([payload.user_id for payload in payloads], dtype=object)
+            self._conversation_ids = np.array([payload.conversation_id for payload in payloads], dtype=object)
+            self._payloads = payloads
+            for row, payload in enumerate(payloads):
+                self._rows_by_message_id.setdefault(payload.message_id, []).append(row)
+            self._size = len(vectors)
+
+        print(f"NumPy VDB loaded {self._size} points from {self.path}")
+
+    def _load_snapshot(self):
+        """
+        Bootstrap the store from NUMPY_VDB_SNAPSHOT_PATH, the vectors are copied without re-embedding.
+        """
+        if not settings.NUMPY_VDB_SNAPSHOT_PATH:
+            return
+
+        snapshot = ThreatSnapshot(settings.NUMPY_VDB_SNAPSHOT_PATH)
+        if snapshot.dim != self.vec_dim:
+            raise ValueError(f"Snapshot dimension {snapshot.dim} does not match EMBEDDING_DIM {self.vec_dim}")
+
+        with self._lock:
+            self._reset(max(len(snapshot), settings.NUMPY_VDB_INITIAL_CAPACITY))
+            for vectors, payloads in snapshot.iter_batches(4096):
+                self.add_vectors(vectors, payloads)
+
+        print(f"NumPy VDB loaded {len(self)} points from the snapshot {settings.NUMPY_VDB_SNAPSHOT_PATH}")
+
+    def save(self):
+        """
+        Persist the live points to NUMPY_VDB_PATH, replacing the previous files atomically.
+        """
+        if not self.path:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock:
+            keep = np.flatnonzero(~self._deleted[:self._size])
+            vectors = self._vectors[keep]
+            payloads = [self._payloads[row].model_dump() for row in keep]
+
+        vectors_path = os.path.join(self.path, VECTORS_FILE)
+        payloads_path = os.path.join(self.path, PAYLOADS_FILE)
+        with open(f"{vectors_path}.tmp", "wb") as f:
+            np.save(f, vectors)
+        with open(f"{payloads_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(payloads, f)
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        os.replace(f"{payloads_path}.tmp", payloads_path)
+
+    def flush(self):
+        self.save()
+
+    def close(self):
+        self.save()
+        print("NumPy VDB has been closed")
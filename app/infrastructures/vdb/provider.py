@@ -0,0 +1,18 @@
+from typing import Callable, Dict
+from app.infrastructures.vdb.base import VectorDBBase
+from app.infrastructures.vdb.qdrant_vdb import QdrantVDB
+from app.infrastructures.vdb.numpy_vdb import NumpyVDB
+
+
+class VectorDBProvider:
+    def __init__(self):
+        self._vdbs: Dict[str, Callable[[], VectorDBBase]] = {
+            "qdrant": QdrantVDB,
+            "numpy": NumpyVDB,
+        }
+
+    def get_vdb(self, vdb_name: str) -> VectorDBBase:
+        vdb_class = self._vdbs.get(vdb_name)
+        if not vdb_class:
+            raise ValueError(f"Unknown vector database: {vdb_name}")
+        return vdb_class()
@@ -1,43 +1,155 @@
 from .base import VectorDBBase
 from app.core.config import settings
-from app.schemas.vdb_schema import PointPayloadSchema
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct, Filter, FilterSelector, FieldCondition, MatchValue
-from app.infrastructures.embedding.gemini_embedding import embed_texts
+from app.schemas.vdb_schema import PointPayloadSchema, SimilarPointSchema
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, Filter, FilterSelector, FieldCondition, MatchValue, MatchAny, PayloadSchemaType,
+    HnswConfigDiff, SearchParams, QuantizationSearchParams, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig
+)
+from app.infrastructures.embedding.embedding_cache import embed_text_cached, aembed_text_cached
 
-from uuid import uuid4
+from asyncio import to_thread
+from typing import List, Optional
+
+
+# payload fields used in filters, each one gets a keyword index
+INDEXED_PAYLOAD_FIELDS = ("message_id", "user_id", "conversation_id")
 
 
 class QdrantVDB(VectorDBBase):
+    """
+    Holds one pooled sync client and, when enabled, one async client. A single instance is
+    created per process (see app.core.dependency) so every request reuses warm connections.
+    """
+
     def __init__(self):
         super().__init__()
-        self.client = QdrantClient(
-            url=settings.QDRANT_HOST,
-            api_key=settings.QDRANT_API_KEY,
-            check_compatibility=False
+        self.client = QdrantClient(**self._client_options())
+        self.async_client: Optional[AsyncQdrantClient] = None
+        if settings.QDRANT_ASYNC_CLIENT_ENABLED:
+            self.async_client = AsyncQdrantClient(**self._client_options())
+        self._search_params = self.search_params()
+
+    @staticmethod
+    def _client_options() -> dict:
+        return {
+            "url": settings.QDRANT_HOST,
+            "api_key": settings.QDRANT_API_KEY,
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+            "grpc_port": settings.QDRANT_GRPC_PORT,
+            "timeout": settings.QDRANT_TIMEOUT,
+            "pool_size": settings.QDRANT_POOL_SIZE,
+            "check_compatibility": False,
+        }
+
+    @staticmethod
+    def collection_options(vec_dim: int) -> dict:
+        """
+        create_collection arguments built from the QDRANT COLLECTION settings.
+        """
+        if settings.QDRANT_QUANTIZATION == "scalar":
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+                )
+            )
+        elif settings.QDRANT_QUANTIZATION == "binary":
+            quantization_config = BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM)
+            )
+        elif settings.QDRANT_QUANTIZATION == "none":
+            quantization_config = None
+        else:
+            raise ValueError(f"Unknown Qdrant quantization: {settings.QDRANT_QUANTIZATION}")
+
+        return {
+            "vectors_config": VectorParams(
+                size=vec_dim,
+                distance=Distance.COSINE,
+                on_disk=settings.QDRANT_VECTORS_ON_DISK
+            ),
+            "hnsw_config": HnswConfigDiff(
+                m=settings.QDRANT_HNSW_M,
+                ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT
+            ),
+            "quantization_config": quantization_config,
+            "on_disk_payload": settings.QDRANT_PAYLOAD_ON_DISK,
+        }
+
+    @staticmethod
+    def search_params() -> SearchParams:
+        quantization_params = None
+        if settings.QDRANT_QUANTIZATION != "none":
+            quantization_params = QuantizationSearchParams(
+                rescore=settings.QDRANT_QUANTIZATION_RESCORE,
+                oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING
+            )
+
+        return SearchParams(hnsw_ef=settings.QDRANT_HNSW_EF_SEARCH, quantization=quantization_params)
+
+    def insert_point(self, message_content, message_id, user_id=None, conversation_id=None):
+        payload = PointPayloadSchema(
+            message_id=message_id,
+            content=message_content,
+            user_id=user_id,
+            conversation_id=conversation_id
         )
+        self._upsert_point(payload, embed_text_cached(message_content))
 
-    def insert_point(self, message_content, message_id):
-        text_embedding = embed_texts([message_content])
-        try:
-            self.client.upsert(
+    def _upsert_point(self, payload: PointPayloadSchema, text_embedding: List[float]):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[self._build_point(payload, text_embedding)]
+        )
+
+    def _build_point(self, payload: PointPayloadSchema, text_embedding: List[float]) -> PointStruct:
+        # the message id is the point id, so that retried upserts overwrite instead of duplicating
+        return PointStruct(
+            id=payload.message_id,
+            vector=text_embedding,
+            payload=payload.model_dump()
+        )
+
+    def add_vectors(self, vectors, payloads):
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                self._build_point(payload, [float(value) for value in vector])
+                for vector, payload in zip(vectors, payloads)
+            ]
+        )
+
+    def iter_points(self, batch_size=1024):
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
                 collection_name=self.collection_name,
-                points=[
-                    PointStruct(
-                        id=str(uuid4()),
-                        vector=text_embedding,
-                        payload=PointPayloadSchema(
-                            message_id=message_id,
-                            content=message_content
-                        ).model_dump()
-                    )
-                ]
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
             )
+            if records:
+                yield (
+                    [record.vector for record in records],
+                    [PointPayloadSchema.model_validate(record.payload) for record in records]
+                )
+            if offset is None:
+                break
 
-        except Exception as e:
-            print(f"An error has occured while inserting points to Qdrant: {e}")
-    
     def delete_points(self, message_id):
+        return self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=self._message_selector(message_id)
+        )
+
+    def delete_points_batch(self, message_ids):
+        if not message_ids:
+            return None
+
         return self.client.delete(
             collection_name=self.collection_name,
             points_selector=FilterSelector(
@@ -45,39 +157,101 @@ class QdrantVDB(VectorDBBase):
                     must=[
                         FieldCondition(
                             key="message_id",
-                            match=MatchValue(value=message_id)
+                            match=MatchAny(any=list(message_ids))
                         )
                     ]
                 )
             )
         )
-    
-    def search_points(self, query, k=10) -> str:
-        embedding_query = embed_texts([query])
+
+    def _message_selector(self, message_id: str) -> FilterSelector:
+        return FilterSelector(
+            filter=Filter(
+                must=[
+                    FieldCondition(
+                        key="message_id",
+                        match=MatchValue(value=message_id)
+                    )
+                ]
+            )
+        )
+
+    def search_similar(self, query, k=10, user_id=None, conversation_id=None) -> List[SimilarPointSchema]:
+        return self._query_similar(embed_text_cached(query), k, self._scope_filter(user_id, conversation_id))
+
+    async def asearch_similar(self, query, k=10, user_id=None, conversation_id=None) -> List[SimilarPointSchema]:
+        embedding_query = await aembed_text_cached(query)
+        scope_filter = self._scope_filter(user_id, conversation_id)
+        if not self.async_client:
+            return await to_thread(self._query_similar, embedding_query, k, scope_filter)
+
+        results = await self.async_client.query_points(
+            collection_name=self.collection_name,
+            query=embedding_query,
+            query_filter=scope_filter,
+            search_params=self._search_params,
+            limit=k,
+            with_payload=True
+        )
+
+        return self._to_similar_points(results.points)
+
+    def _query_similar(self, embedding_query: List[float], k: int, scope_filter: Optional[Filter] = None) -> List[SimilarPointSchema]:
         results = self.client.query_points(
             collection_name=self.collection_name,
             query=embedding_query,
+            query_filter=scope_filter,
+            search_params=self._search_params,
             limit=k,
             with_payload=True
         )
 
-        formatted_str = "SIMILAR MESSAGES WITH SIMILARITY SCORE:\n"
+        return self._to_similar_points(results.points)
+
+    def _scope_filter(self, user_id: Optional[str], conversation_id: Optional[str]) -> Optional[Filter]:
+        conditions = [
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in (("user_id", user_id), ("conversation_id", conversation_id))
+            if value is not None
+        ]
 
-        for i, res in enumerate(results.points):
-            formatted_str += f"{i + 1}. {(res.payload['content'])}\nSimilarity score: {res.score}\n\n"
+        return Filter(must=conditions) if conditions else None
+
+    def _to_similar_points(self, points) -> List[SimilarPointSchema]:
+        return [
+            SimilarPointSchema(
+                message_id=res.payload['message_id'],
+                content=res.payload['content'],
+                score=res.score
+            )
+            for res in points
+        ]
 
-        return formatted_str
-    
     def initialize(self):
         if not self.client.collection_exists(self.collection_name):
             print(f"Collection {self.collection_name} does not exist. Creating a new collection...")
             self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(size=self.vec_dim, distance=Distance.COSINE),
+                **self.collection_options(self.vec_dim)
             )
+
+        payload_schema = self.client.get_collection(self.collection_name).payload_schema or {}
+        for field_name in INDEXED_PAYLOAD_FIELDS:
+            if field_name not in payload_schema:
+                print(f"Creating payload index on {field_name}...")
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
         print(f"Collection {self.collection_name} is ready!")
 
-    
+
     def close(self):
         self.client.close()
-        print(f"Qdrant connection has been closed")
\ No newline at end of file
+        print(f"Qdrant connection has been closed")
+
+    async def aclose(self):
+        if self.async_client:
+            await self.async_client.close()
+        await to_thread(self.close)
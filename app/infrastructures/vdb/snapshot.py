@@ -0,0 +1,183 @@
+"""
+Versioned on-disk snapshot of the threat index, used to bootstrap a new worker without
+re-reading every point from a remote vector database.
+
+A snapshot is a directory holding:
+    manifest.json  format name, version, point count, dimension and vector dtype
+    vectors.bin    raw little-endian (count, dim) block of float32, or int8 scaled by INT8_SCALE
+    offsets.bin    little-endian uint64 offsets, PAYLOAD_FIELDS per point plus a final end offset
+    strings.bin    the UTF-8 payload strings packed back to back
+
+vectors.bin and offsets.bin are memory-mapped as they are, nothing is parsed on load.
+The manifest is written last, so a directory without one is an incomplete snapshot.
+"""
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import json
+import os
+import numpy as np
+
+from app.schemas.vdb_schema import PointPayloadSchema
+
+
+SNAPSHOT_FORMAT = "safe-speak-threat-snapshot"
+SNAPSHOT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.bin"
+OFFSETS_FILE = "offsets.bin"
+STRINGS_FILE = "strings.bin"
+
+PAYLOAD_FIELDS = ("message_id", "content", "user_id", "conversation_id")
+VECTOR_DTYPES = {"float32": np.dtype("<f4"), "int8": np.dtype("i1")}
+OFFSET_DTYPE = np.dtype("<u8")
+INT8_SCALE = 127.0
+
+
+class SnapshotWriter:
+    """
+    Streams points into a snapshot directory, batch by batch.
+    """
+
+    def __init__(self, path: str, dim: int, dtype: str = "float32"):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported snapshot dtype: {dtype}")
+
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.count = 0
+        self._offset = 0
+        self._vectors_file = open(os.path.join(path, VECTORS_FILE), "wb")
+        self._offsets_file = open(os.path.join(path, OFFSETS_FILE), "wb")
+        self._strings_file = open(os.path.join(path, STRINGS_FILE), "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_files()
+
+    def add(self, vectors, payloads: Sequence[PointPayloadSchema]):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(vectors) != len(payloads):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(payloads)} payloads")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        if self.dtype == "int8":
+            block = np.clip(np.rint(vectors * INT8_SCALE), -INT8_SCALE, INT8_SCALE).astype(VECTOR_DTYPES["int8"])
+        else:
+            block = vectors.astype(VECTOR_DTYPES["float32"])
+        self._vectors_file.write(block.tobytes())
+
+        offsets = []
+        for payload in payloads:
+            for field in PAYLOAD_FIELDS:
+                encoded = (getattr(payload, field) or "").encode("utf-8")
+                offsets.append(self._offset)
+                self._strings_file.write(encoded)
+                self._offset += len(encoded)
+        self._offsets_file.write(np.asarray(offsets, dtype=OFFSET_DTYPE).tobytes())
+
+        self.count += len(payloads)
+
+    def close(self):
+        self._offsets_file.write(np.asarray([self._offset], dtype=OFFSET_DTYPE).tobytes())
+        self._close_files()
+
+        with open(os.path.join(self.path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "format": SNAPSHOT_FORMAT,
+                "version": SNAPSHOT_VERSION,
+                "count": self.count,
+                "dim": self.dim,
+                "dtype": self.dtype,
+                "payload_fields": list(PAYLOAD_FIELDS),
+            }, f)
+
+    def _close_files(self):
+        self._vectors_file.close()
+        self._offsets_file.close()
+        self._strings_file.close()
+
+
+class ThreatSnapshot:
+    """
+    Read-only view over a snapshot directory.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a threat snapshot")
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {manifest.get('version')}, expected {SNAPSHOT_VERSION}")
+
+        self.path = path
+        self.count = manifest["count"]
+        self.dim = manifest["dim"]
+        self.dtype = manifest["dtype"]
+        self.vectors = self._map(VECTORS_FILE, VECTOR_DTYPES[self.dtype], (self.count, self.dim))
+        self.offsets = self._map(OFFSETS_FILE, OFFSET_DTYPE, (self.count * len(PAYLOAD_FIELDS) + 1,))
+        self.strings = self._map(STRINGS_FILE, np.dtype("u1"), (int(self.offsets[-1]),))
+
+    def _map(self, file_name: str, dtype: np.dtype, shape: Tuple[int, ...]) -> np.ndarray:
+        if not np.prod(shape):
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.path, file_name), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_vectors(self, start: int = 0, end: int = None) -> np.ndarray:
+        """
+        float32 vectors of the points in [start, end), int8 snapshots are scaled back.
+        """
+        block = self.vectors[start:end]
+        if self.dtype == "int8":
+            return block.astype(np.float32) / INT8_SCALE
+        return np.asarray(block, dtype=np.float32)
+
+    def get_payload(self, index: int) -> PointPayloadSchema:
+        field_count = len(PAYLOAD_FIELDS)
+        values = {}
+        for i, field in enumerate(PAYLOAD_FIELDS):
+            start = int(self.offsets[index * field_count + i])
+            end = int(self.offsets[index * field_count + i + 1])
+            values[field] = self.strings[start:end].tobytes().decode("utf-8") or None
+
+        values["content"] = values["content"] or ""
+        return PointPayloadSchema(**values)
+
+    def iter_batches(self, batch_size: int = 1024) -> Iterator[Tuple[np.ndarray, List[PointPayloadSchema]]]:
+        for start in range(0, self.count, batch_size):
+            end = min(start + batch_size, self.count)
+            yield self.get_vectors(start, end), [self.get_payload(i) for i in range(start, end)]
+
+
+def write_snapshot(
+    path: str,
+    batches: Iterable[Tuple[Sequence[Sequence[float]], Sequence[PointPayloadSchema]]],
+    dim: int,
+    dtype: str = "float32"
+) -> int:
+    """
+    Write (vectors, payloads) batches to a snapshot directory, returns the number of points.
+    """
+    with SnapshotWriter(path, dim, dtype) as writer:
+        for vectors, payloads in batches:
+            writer.add(vectors, payloads)
+
+    return writer.count
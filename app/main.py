@@ -4,7 +4,8 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.api.v1.routes import router as v1_router
 from app.core.handlers import add_exception_handlers
-from app.core.dependency import initialize_dependencies
+from app.core.dependency import initialize_dependencies, close_dependencies
+from app.infrastructures.http_client import close_http_client
 
 
 class AppCreator:
@@ -36,8 +37,10 @@ class AppCreator:
     
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        initialize_dependencies()
+        initialize_dependencies(app)
         yield
+        await close_dependencies(app)
+        await close_http_client()
 
     
 
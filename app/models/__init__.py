@@ -2,10 +2,12 @@ from .conversation import Conversation
 from .message import Message
 from .user import User
 from .threat_indicator import ThreatIndicator
+from .vdb_outbox import VdbOutbox
 
 __all__ = [
     "Conversation",
     "Message",
     "User",
     "ThreatIndicator",
+    "VdbOutbox",
 ]
\ No newline at end of file
@@ -17,6 +17,8 @@ class Message(Base):
     type = Column(Text, nullable=False)
     content = Column(Text, nullable=False)
     img_url = Column(Text, nullable=True)
+    # set when the deferred verdict of the message could not be computed
+    verdict_error = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Text, DateTime, Integer, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.core.database import Base
+
+
+class VdbOutbox(Base):
+    """
+    Pending vector database writes, committed together with the threat indicator change
+    that caused them and drained by the VDB outbox worker.
+    """
+    __tablename__ = "VdbOutbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    operation = Column(Text, nullable=False)
+    # no foreign key, deletes must still reach the VDB after the message is gone
+    message_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    conversation_id = Column(UUID(as_uuid=True), nullable=True)
+    content = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=func.now())
+    # set while a worker applies the entry, no other entry of the message is claimed until then
+    claimed_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=func.now())
+
+    __table_args__ = (
+        Index('vdb_outbox_next_attempt_at_index', 'next_attempt_at'),
+    )
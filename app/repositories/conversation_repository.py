@@ -1,6 +1,8 @@
 from uuid import UUID
 from datetime import datetime, timezone
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.conversation import Conversation
 from app.schemas.conversation_schema import ConversationCreate, ConversationUpdate
 from typing import List, Optional
@@ -50,4 +52,74 @@ class ConversationRepository:
             
         self.db.delete(db_conversation)
         self.db.commit()
+        return True
+
+
+class AsyncConversationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_conversation(self, conversation: ConversationCreate) -> Conversation:
+        db_conversation = Conversation(
+            user_id=conversation.user_id,
+            title=conversation.title
+        )
+        self.db.add(db_conversation)
+        await self.db.commit()
+        await self.db.refresh(db_conversation)
+        return db_conversation
+
+    async def get_conversation(self, conversation_id: UUID) -> Optional[Conversation]:
+        result = await self.db.execute(select(Conversation).filter(Conversation.id == conversation_id))
+        return result.scalars().first()
+
+    async def get_user_conversations(self, user_id: UUID) -> List[Conversation]:
+        result = await self.db.execute(select(Conversation).filter(Conversation.user_id == user_id).order_by(Conversation.updated_at.desc()))
+        return result.scalars().all()
+
+    async def update_conversation(
+        self, 
+        conversation_id: UUID, 
+        conversation: ConversationUpdate
+    ) -> Optional[Conversation]:
+        db_conversation = await self.get_conversation(conversation_id)
+        if db_conversation is None:
+            return None
+            
+        if conversation.title:
+            db_conversation.title = conversation.title
+        
+        db_conversation.updated_at = datetime.now(timezone.utc)
+
+        await self.db.commit()
+        await self.db.refresh(db_conversation)
+        return db_conversation
+
+    async def replace_title(
+        self,
+        conversation_id: UUID,
+        expected_title: Optional[str],
+        new_title: str
+    ) -> Optional[Conversation]:
+        """
+        Set the title only if it is still expected_title, so a title changed in the meantime
+        is never overwritten. The conversation keeps its position (updated_at is unchanged).
+        """
+        db_conversation = await self.db.scalar(
+            update(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.title == expected_title)
+            .values(title=new_title, updated_at=Conversation.updated_at)
+            .returning(Conversation)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return db_conversation
+
+    async def delete_conversation(self, conversation_id: UUID) -> bool:
+        db_conversation = await self.get_conversation(conversation_id)
+        if db_conversation is None:
+            return False
+            
+        await self.db.delete(db_conversation)
+        await self.db.commit()
         return True
\ No newline at end of file
@@ -0,0 +1,149 @@
+from uuid import uuid4
+from datetime import timedelta
+from typing import Optional, Tuple
+from sqlalchemy import insert, update, func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.models.conversation import Conversation
+from app.models.threat_indicator import ThreatIndicator
+from app.repositories.vdb_outbox_repository import AsyncVdbOutboxRepository
+from app.schemas.message_schema import MessageCreate
+
+
+class AsyncMessageExchangeRepository:
+    """
+    Persists one user/adversary exchange (both messages, the threat indicator, its VDB outbox
+    entry and the conversation bump) in a single transaction, reading the generated columns
+    back with RETURNING instead of refreshing every row.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_exchange(
+        self,
+        user_message: MessageCreate,
+        adversary_message: MessageCreate,
+        conversation_title: Optional[str] = None,
+        threat_description: Optional[str] = None,
+        is_malicious: bool = False,
+        index_threat: bool = True,
+        user_id: Optional[str] = None
+    ) -> Tuple[Message, Message, Conversation, Optional[ThreatIndicator]]:
+        user_msg_id, adversary_msg_id = uuid4(), uuid4()
+
+        # both rows share the transaction timestamp, keep the user message strictly first
+        created_at = func.now()
+        result = await self.db.execute(
+            insert(Message).values([
+                self._message_values(user_msg_id, user_message, "user", created_at),
+                self._message_values(adversary_msg_id, adversary_message, "assistant", created_at + timedelta(microseconds=1)),
+            ]).returning(Message)
+        )
+        messages = {message.id: message for message in result.scalars().all()}
+        db_user_msg, db_adversary_msg = messages[user_msg_id], messages[adversary_msg_id]
+
+        db_threat = None
+        if threat_description is not None:
+            db_threat = await self._insert_threat(
+                adversary_msg_id,
+                adversary_message.content,
+                threat_description,
+                is_malicious=is_malicious,
+                index_threat=index_threat,
+                user_id=user_id,
+                conversation_id=user_message.conversation_id
+            )
+
+        conversation_values = {"updated_at": func.now()}
+        if conversation_title:
+            conversation_values["title"] = conversation_title
+
+        db_conversation = await self.db.scalar(
+            update(Conversation)
+            .where(Conversation.id == user_message.conversation_id)
+            .values(**conversation_values)
+            .returning(Conversation)
+            .execution_options(synchronize_session=False)
+        )
+
+        await self.db.commit()
+
+        set_committed_value(db_user_msg, "threat_indicator", None)
+        set_committed_value(db_adversary_msg, "threat_indicator", db_threat)
+
+        return db_user_msg, db_adversary_msg, db_conversation, db_threat
+
+    async def create_deferred_verdict(
+        self,
+        adversary_message_id,
+        adversary_content: str,
+        conversation_id,
+        threat_description: str,
+        is_malicious: bool = False,
+        index_threat: bool = True,
+        user_id: Optional[str] = None
+    ) -> ThreatIndicator:
+        """
+        Persist the verdict of an already stored exchange.
+        """
+        db_threat = await self._insert_threat(
+            adversary_message_id,
+            adversary_content,
+            threat_description,
+            is_malicious=is_malicious,
+            index_threat=index_threat,
+            user_id=user_id,
+            conversation_id=conversation_id
+        )
+
+        await self.db.commit()
+
+        return db_threat
+
+    async def _insert_threat(
+        self,
+        message_id,
+        content: str,
+        threat_description: str,
+        is_malicious: bool = False,
+        index_threat: bool = True,
+        user_id: Optional[str] = None,
+        conversation_id=None
+    ) -> ThreatIndicator:
+        db_threat = await self.db.scalar(
+            insert(ThreatIndicator).values(
+                message_id=message_id,
+                is_threat=True if threat_description != "" else False,
+                description=threat_description,
+                user_description=""
+            ).returning(ThreatIndicator)
+        )
+
+        # benign verdicts carry an explanation too, only the verdict decides what is indexed
+        if is_malicious and index_threat:
+            AsyncVdbOutboxRepository(self.db).enqueue_upsert(
+                message_id,
+                content,
+                user_id=user_id,
+                conversation_id=conversation_id
+            )
+
+        return db_threat
+
+    def _message_values(self, message_id, message: MessageCreate, role: str, created_at) -> dict:
+        return {
+            "id": message_id,
+            "conversation_id": message.conversation_id,
+            "role": role,
+            "agent_model": message.agent_model,
+            "model": message.model,
+            "rag_enabled": message.rag_enabled,
+            "type": message.type,
+            "content": message.content,
+            "img_url": message.img_url,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
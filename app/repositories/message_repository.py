@@ -1,5 +1,7 @@
 from uuid import UUID
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.message import Message
 from app.schemas.message_schema import MessageCreate
@@ -35,4 +37,25 @@ class MessageRepository:
     
     def load_recent_messages(self, conversation_id: UUID, n_messages: int):
         return self.db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at.desc()).limit(n_messages).all()
-    
\ No newline at end of file
+
+
+class AsyncMessageRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def mark_verdict_failed(self, message_id: UUID, error: str):
+        await self.db.execute(
+            update(Message)
+            .where(Message.id == message_id)
+            .values(verdict_error=error)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+    async def load_messages_by_convo_id(self, conversation_id: UUID):
+        result = await self.db.execute(select(Message).filter(Message.conversation_id == conversation_id).options(joinedload(Message.threat_indicator)).order_by(Message.created_at.asc()))
+        return result.scalars().all()
+    
+    async def load_recent_messages(self, conversation_id: UUID, n_messages: int):
+        result = await self.db.execute(select(Message).filter(Message.conversation_id == conversation_id).order_by(Message.created_at.desc()).limit(n_messages))
+        return result.scalars().all()
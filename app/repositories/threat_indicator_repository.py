@@ -1,5 +1,7 @@
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.threat_indicator import ThreatIndicator
 
@@ -28,4 +30,29 @@ class ThreatIndicatorRepository:
         self.db.commit()
         self.db.refresh(db_threat)
 
+        return db_threat
+
+
+class AsyncThreatIndicatorRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_threat_by_msg_id(self, message_id: str) -> ThreatIndicator:
+        result = await self.db.execute(select(ThreatIndicator).filter(ThreatIndicator.message_id == message_id))
+        return result.scalars().first()
+    
+    async def update_threat_status_by_msg_id(self, message_id: str, commit: bool = True) -> ThreatIndicator:
+        """
+        With commit=False the change is only flushed, so the caller can commit it with related rows.
+        """
+        result = await self.db.execute(select(ThreatIndicator).filter(ThreatIndicator.message_id == message_id))
+        db_threat = result.scalars().first()
+        db_threat.is_threat = not db_threat.is_threat
+        if not commit:
+            await self.db.flush()
+            return db_threat
+
+        await self.db.commit()
+        await self.db.refresh(db_threat)
+
         return db_threat
\ No newline at end of file
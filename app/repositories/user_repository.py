@@ -1,7 +1,9 @@
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.models.user import User
@@ -188,6 +190,118 @@ class UserRepository:
             return True
         except Exception as e:
             self.db.rollback()
+            if isinstance(e, NotFoundException):
+                raise
+            raise DatabaseException(f"Unexpected error deleting user: {str(e)}")
+
+
+class AsyncUserRepository:
+    """
+    Async counterpart of UserRepository, see it for the documentation of each method.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_user(self, user_create: UserCreate) -> User:
+        try:
+            db_user = User(
+                username=user_create.username,
+                email=user_create.email,
+                hashed_password=user_create.password
+            )
+            self.db.add(db_user)
+            await self.db.commit()
+            await self.db.refresh(db_user)
+            return db_user
+        except IntegrityError as e:
+            await self.db.rollback()
+            if "email" in str(e.orig):
+                raise DuplicateEntryException("Email already exists")
+            raise DatabaseException("Database integrity error occurred")
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Unexpected error creating user: {str(e)}")
+
+    async def create_user_oauth(self, user_create: UserCreateOAuth) -> User:
+        try:
+            db_user = User(
+                username=user_create.username,
+                email=user_create.email,
+                oauth_id=user_create.oauth_id,
+                oauth_provider=user_create.oauth_provider
+            )
+            self.db.add(db_user)
+            await self.db.commit()
+            await self.db.refresh(db_user)
+            return db_user
+        except IntegrityError as e:
+            await self.db.rollback()
+            if "email" in str(e.orig):
+                raise DuplicateEntryException("Email already exists")
+            raise DatabaseException("Database integrity error occurred")
+        except Exception as e:
+            await self.db.rollback()
+            raise DatabaseException(f"Unexpected error creating user: {str(e)}")
+
+    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
+        result = await self.db.execute(select(User).filter(User.id == user_id))
+        return result.scalars().first()
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        result = await self.db.execute(select(User).filter(User.username == username))
+        return result.scalars().first()
+
+    async def update_user(self, user_id: UUID, user_update: UserUpdate) -> User:
+        try:
+            db_user = await self.get_user_by_id(user_id)
+            if not db_user:
+                raise NotFoundException("User not found")
+
+            update_data = user_update.model_dump(exclude_unset=True)
+            
+            # Check for duplicate username if it's being updated
+            if 'username' in update_data:
+                existing_user = await self.get_user_by_username(update_data['username'])
+                if existing_user and existing_user.id != user_id:
+                    raise DuplicateEntryException("Username already exists")
+
+            # Check for duplicate email if it's being updated
+            if 'email' in update_data:
+                existing_user = await self.get_user_by_email(update_data['email'])
+                if existing_user and existing_user.id != user_id:
+                    raise DuplicateEntryException("Email already exists")
+
+            for key, value in update_data.items():
+                setattr(db_user, key, value)
+
+            await self.db.commit()
+            await self.db.refresh(db_user)
+            return db_user
+        except IntegrityError:
+            await self.db.rollback()
+            raise DatabaseException("Database integrity error occurred")
+        except Exception as e:
+            await self.db.rollback()
+            if isinstance(e, (NotFoundException, DuplicateEntryException)):
+                raise
+            raise DatabaseException(f"Unexpected error updating user: {str(e)}")
+
+    async def delete_user(self, user_id: UUID) -> bool:
+        try:
+            db_user = await self.get_user_by_id(user_id)
+            if not db_user:
+                raise NotFoundException("User not found")
+
+            await self.db.delete(db_user)
+            await self.db.commit()
+            return True
+        except Exception as e:
+            await self.db.rollback()
             if isinstance(e, NotFoundException):
                 raise
             raise DatabaseException(f"Unexpected error deleting user: {str(e)}")
\ No newline at end of file
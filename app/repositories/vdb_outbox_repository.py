@@ -0,0 +1,130 @@
+from datetime import timedelta
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select, delete, update, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.vdb_outbox import VdbOutbox
+
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# transaction-level advisory lock serialising the claims of every outbox worker
+CLAIM_LOCK_ID = 7301422001
+
+
+class AsyncVdbOutboxRepository:
+    """
+    The enqueue methods only add the row to the session, the caller commits it
+    together with the change that produced it.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def enqueue_upsert(
+        self,
+        message_id: UUID,
+        content: str,
+        user_id: Optional[UUID] = None,
+        conversation_id: Optional[UUID] = None
+    ) -> VdbOutbox:
+        entry = VdbOutbox(
+            operation=UPSERT,
+            message_id=message_id,
+            content=content,
+            user_id=UUID(str(user_id)) if user_id else None,
+            conversation_id=UUID(str(conversation_id)) if conversation_id else None,
+            attempts=0
+        )
+        self.db.add(entry)
+
+        return entry
+
+    def enqueue_delete(self, message_id: UUID) -> VdbOutbox:
+        entry = VdbOutbox(operation=DELETE, message_id=message_id, attempts=0)
+        self.db.add(entry)
+
+        return entry
+
+    async def claim_due_entries(self, limit: int, claim_timeout: float) -> List[VdbOutbox]:
+        """
+        Claim the oldest due entries for claim_timeout seconds. Messages with an entry claimed by
+        another worker are skipped, so the operations of a message are never applied concurrently.
+        Once committed the claim holds without keeping a transaction open, and the entries of a
+        crashed worker can be claimed again when it expires.
+        """
+        # claims are serialised across processes, each one sees every committed claim
+        await self.db.execute(select(func.pg_advisory_xact_lock(CLAIM_LOCK_ID)))
+
+        claimed_messages = select(VdbOutbox.message_id).where(VdbOutbox.claimed_until > func.now())
+        result = await self.db.execute(
+            select(VdbOutbox)
+            .where(
+                VdbOutbox.next_attempt_at <= func.now(),
+                or_(VdbOutbox.claimed_until.is_(None), VdbOutbox.claimed_until <= func.now()),
+                VdbOutbox.message_id.not_in(claimed_messages)
+            )
+            .order_by(VdbOutbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        entries = list(result.scalars().all())
+
+        if entries:
+            await self.db.execute(
+                update(VdbOutbox)
+                .where(VdbOutbox.id.in_([entry.id for entry in entries]))
+                .values(claimed_until=func.now() + timedelta(seconds=claim_timeout))
+            )
+
+        return entries
+
+    async def get_superseded_entries(self, entries: List[VdbOutbox]) -> List[VdbOutbox]:
+        """
+        The entries for which a newer entry of the same message exists, anywhere in the table.
+        """
+        if not entries:
+            return []
+
+        result = await self.db.execute(
+            select(VdbOutbox.message_id, func.max(VdbOutbox.created_at))
+            .where(VdbOutbox.message_id.in_({entry.message_id for entry in entries}))
+            .group_by(VdbOutbox.message_id)
+        )
+        latest_created_at = dict(result.all())
+
+        return [entry for entry in entries if entry.created_at < latest_created_at[entry.message_id]]
+
+    async def delete_entries(self, entry_ids: List[UUID]):
+        if entry_ids:
+            await self.db.execute(delete(VdbOutbox).where(VdbOutbox.id.in_(entry_ids)))
+
+    async def delete_applied_entries(self, entries: List[VdbOutbox]):
+        """
+        Delete applied entries together with any older entry of the same message, so that an
+        older operation still in backoff can never undo a newer one.
+        """
+        if entries:
+            await self.db.execute(
+                delete(VdbOutbox).where(or_(*(
+                    and_(VdbOutbox.message_id == entry.message_id, VdbOutbox.created_at <= entry.created_at)
+                    for entry in entries
+                )))
+            )
+
+    async def reschedule_entries(self, entries: List[VdbOutbox], error: str, base_backoff: float, max_backoff: float):
+        for entry in entries:
+            # the exponent is capped, 2.0 ** 1024 overflows and would wedge the entry at the queue head
+            backoff = min(max_backoff, base_backoff * 2 ** min(entry.attempts, 30))
+            await self.db.execute(
+                update(VdbOutbox)
+                .where(VdbOutbox.id == entry.id)
+                .values(
+                    attempts=entry.attempts + 1,
+                    last_error=error,
+                    next_attempt_at=func.now() + timedelta(seconds=backoff),
+                    claimed_until=None
+                )
+            )
@@ -15,7 +15,8 @@ class MessageBase(BaseModel):
 
 
 class MessageCreate(MessageBase):
-    pass
+    # return once the messages are stored, the verdict is delivered on the event stream
+    deferred_verdict: Optional[bool] = False
 
 
 class MessageUpdate(BaseModel):
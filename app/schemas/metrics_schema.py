@@ -0,0 +1,61 @@
+from pydantic import BaseModel
+from typing import Optional, Dict
+
+
+class DatabasePoolStatus(BaseModel):
+    """Schema for the database connection pool occupancy"""
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+
+
+class DatabasePoolsStatus(BaseModel):
+    """Schema for the sync and async connection pools occupancy"""
+    sync_pool: DatabasePoolStatus
+    async_pool: DatabasePoolStatus
+
+
+
+class VerdictCacheStatus(BaseModel):
+    """Schema for the verdict cache counters"""
+    backend: str
+    hits: int
+    misses: int
+    hit_rate: float
+    size: Optional[int] = None
+    max_size: Optional[int] = None
+
+
+class ProtectionTierCount(BaseModel):
+    count: int
+    share: float
+
+
+class ProtectionTierStatus(BaseModel):
+    """Schema for the share of verdicts produced by each protection tier"""
+    total: int
+    tiers: Dict[str, ProtectionTierCount]
+
+
+class ProtectionStageTiming(BaseModel):
+    count: int
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class ProtectionStageStatus(BaseModel):
+    """Schema for the latency of each protection pipeline stage"""
+    stages: Dict[str, ProtectionStageTiming]
+
+
+class WorkerPoolStatus(BaseModel):
+    """Schema for the counters of a background worker pool"""
+    workers: int
+    queued: int
+    completed: int
+    failed: int
+    rejected: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, UUID4
-from typing import Optional
+from typing import Optional, List
 
 
 class ProtectionResponse(BaseModel):
@@ -8,6 +8,26 @@ class ProtectionResponse(BaseModel):
     explanation: str
 
 
+class ProtectionBatchItem(BaseModel):
+    """Schema for one verdict of a batched protection request"""
+    index: int
+    is_malicious: bool
+    explanation: str
+
+
+class PreFilterResult(BaseModel):
+    """Schema for the local pre-filter classification"""
+    verdict: str
+    score: float
+    reasons: List[str] = []
+
+
+class ImageExtractionResult(BaseModel):
+    """Schema for the image urls found in a message"""
+    image_urls: List[str] = []
+    ambiguous_urls: List[str] = []
+
+
 class ThreatResponse(BaseModel):
     """Schema for threat response to client"""
     id: UUID4
@@ -19,4 +39,9 @@ class ThreatResponse(BaseModel):
     class Config:
         from_attributes = True
 
-    
+
+class VerdictStatus(BaseModel):
+    """Schema for the verdict of a message, pending while it is computed in the background and failed if it could not be"""
+    message_id: UUID4
+    status: str
+    threat: Optional[ThreatResponse] = None
@@ -1,10 +1,11 @@
 from pydantic import BaseModel
 from typing import Union
-from app.schemas.protection_schema import ThreatResponse
+from app.schemas.protection_schema import ThreatResponse, ProtectionResponse
 from app.schemas.message_schema import Message
 from app.schemas.conversation_schema import Conversation
 
 
 class StreamResponseData(BaseModel):
     type: str
-    data: Union[ThreatResponse, Message, Conversation, str]
\ No newline at end of file
+    data: Union[ThreatResponse, ProtectionResponse, Message, Conversation, str]
+    provisional: bool = False
\ No newline at end of file
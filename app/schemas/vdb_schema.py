@@ -1,13 +1,21 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class PointPayloadSchema(BaseModel):
     message_id: str
     content: str
+    user_id: Optional[str] = None
+    conversation_id: Optional[str] = None
 
 
 class PointSchema(BaseModel):
     id: str
     vector: List[float]
-    payload: PointPayloadSchema
\ No newline at end of file
+    payload: PointPayloadSchema
+
+
+class SimilarPointSchema(BaseModel):
+    message_id: str
+    content: str
+    score: float
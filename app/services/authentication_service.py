@@ -1,12 +1,13 @@
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from asyncio import to_thread
+from sqlalchemy.ext.asyncio import AsyncSession
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 import httpx
 
 from app.core.config import settings
 from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.schemas.token_schema import Token
 from app.schemas.base_response_schema import BaseResponse
 from app.schemas.user_schema import UserLogin, UserCreate, UserCreateOAuth, User, UserUpdate
@@ -14,19 +15,19 @@ from app.core.exceptions import UnauthorizedException, DuplicateEntryException,
 
 
 class AuthenticationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.user_repository = UserRepository(db)
+        self.user_repository = AsyncUserRepository(db)
 
-    def register_user(self, user_create: UserCreate) -> User:
-        if self.user_repository.get_user_by_email(user_create.email):
+    async def register_user(self, user_create: UserCreate) -> User:
+        if await self.user_repository.get_user_by_email(user_create.email):
             raise DuplicateEntryException("Email already exists")
-        if self.user_repository.get_user_by_username(user_create.username):
+        if await self.user_repository.get_user_by_username(user_create.username):
             raise DuplicateEntryException("Username already exists")
         
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await to_thread(get_password_hash, user_create.password)
 
-        db_user = self.user_repository.create_user(
+        db_user = await self.user_repository.create_user(
             UserCreate(
                 username=user_create.username,
                 email=user_create.email,
@@ -36,19 +37,19 @@ class AuthenticationService:
 
         return User.model_validate(db_user)
     
-    def authenticate_user(self, user_login: UserLogin) -> User:
-        user = self.user_repository.get_user_by_email(user_login.email)
-        if not user or not verify_password(user_login.password, user.hashed_password):
+    async def authenticate_user(self, user_login: UserLogin) -> User:
+        user = await self.user_repository.get_user_by_email(user_login.email)
+        if not user or not await to_thread(verify_password, user_login.password, user.hashed_password):
             raise UnauthorizedException("Invalid email or password")
         
         return User.model_validate(user)
     
-    def authenticate_user_oauth(self, oauth_provider: str, oauth_code: str) -> User:
+    async def authenticate_user_oauth(self, oauth_provider: str, oauth_code: str) -> User:
         if oauth_provider not in settings.OAUTH_PROVIDERS:
             raise NotFoundException("OAuth provider not supported")
         
         # Google implementation for now
-        with httpx.Client() as client:
+        async with httpx.AsyncClient() as client:
             token_data = {
                 "code": oauth_code,
                 "client_id": settings.GOOGLE_OAUTH_CLIENT_ID,
@@ -56,7 +57,7 @@ class AuthenticationService:
                 "redirect_uri": settings.GOOGLE_OAUTH_REDIRECT_URI,
                 "grant_type": "authorization_code",
             }
-            token_response = client.post(settings.GOOGLE_OAUTH_TOKEN_URI, data=token_data)
+            token_response = await client.post(settings.GOOGLE_OAUTH_TOKEN_URI, data=token_data)
             token_json = token_response.json()
 
             if token_response.status_code != 200:
@@ -67,7 +68,8 @@ class AuthenticationService:
                 raise UnauthorizedException("No ID token received")
 
         try:
-            user_info = id_token.verify_oauth2_token(
+            user_info = await to_thread(
+                id_token.verify_oauth2_token,
                 id_token_jwt,
                 google_requests.Request(),
                 settings.GOOGLE_OAUTH_CLIENT_ID
@@ -80,9 +82,9 @@ class AuthenticationService:
         oauth_id = user_info.get("sub")
         
         # check if user already exists
-        user = self.user_repository.get_user_by_email(email)
+        user = await self.user_repository.get_user_by_email(email)
         if not user:
-            user = self.user_repository.create_user_oauth(
+            user = await self.user_repository.create_user_oauth(
                 UserCreateOAuth(
                     username=username,
                     email=email,
@@ -112,7 +114,7 @@ class AuthenticationService:
             refresh_token=refresh_token
         )
     
-    def refresh_access_token(self, refresh_token: str) -> Token:
+    async def refresh_access_token(self, refresh_token: str) -> Token:
         token_exception = UnauthorizedException("Invalid refresh token")
         
         if not refresh_token:
@@ -128,22 +130,22 @@ class AuthenticationService:
             raise token_exception
         
         # Verify user still exists
-        user = self.user_repository.get_user_by_id(user_id)
+        user = await self.user_repository.get_user_by_id(user_id)
         if not user:
             raise token_exception
 
         return self.create_tokens(user_id)
     
-    def get_user_details_by_id(self, user_id: str) -> User:
-        user = self.user_repository.get_user_by_id(user_id)
+    async def get_user_details_by_id(self, user_id: str) -> User:
+        user = await self.user_repository.get_user_by_id(user_id)
         if not user:
             raise NotFoundException("User not found")
         return user
     
-    def update_user_img(self, user_update: UserUpdate, user_id: str) -> BaseResponse:
+    async def update_user_img(self, user_update: UserUpdate, user_id: str) -> BaseResponse:
         if not user_update.img_url:
             raise UserInputException(detail="img_url does not exist")
 
-        self.user_repository.update_user(user_id, user_update)
+        await self.user_repository.update_user(user_id, user_update)
 
         return BaseResponse(detail="profile updated successfuly")
\ No newline at end of file
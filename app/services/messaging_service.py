@@ -1,30 +1,50 @@
-from sqlalchemy.orm import Session
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 from fastapi import HTTPException, status
-from asyncio import to_thread
+from contextlib import aclosing
+from functools import partial
+import asyncio
 
-from app.repositories.conversation_repository import ConversationRepository
-from app.repositories.message_repository import MessageRepository
-from app.repositories.threat_indicator_repository import ThreatIndicatorRepository
+from app.core.config import settings
+from app.core.database import async_session_scope
+from app.repositories.conversation_repository import AsyncConversationRepository
+from app.repositories.message_repository import AsyncMessageRepository
+from app.repositories.threat_indicator_repository import AsyncThreatIndicatorRepository
+from app.repositories.message_exchange_repository import AsyncMessageExchangeRepository
+from app.repositories.vdb_outbox_repository import AsyncVdbOutboxRepository
 from app.schemas.message_schema import MessageCreate, Message
 from app.schemas.stream_schema import StreamResponseData
-from app.schemas.protection_schema import ThreatResponse
-from app.schemas.conversation_schema import ConversationUpdate, Conversation
+from app.schemas.protection_schema import ThreatResponse, VerdictStatus
+from app.schemas.conversation_schema import Conversation
 from app.infrastructures.protection_agent.base import ProtectionAgentBase
+from app.infrastructures.protection_agent.streaming import StreamingVerdictMonitor
 from app.infrastructures.adversary.base import AdversaryBase
 from app.infrastructures.vdb.base import VectorDBBase
+from app.infrastructures.event_broker import event_broker
 from app.core.exceptions import ForbiddenException, NotFoundException, AppExceptionBase
+from app.services.protection_service import ProtectionService
 from app.utils.message import format_messages_to_history
+from app.utils.worker_pool import BoundedWorkerPool
+from app.utils.title import generate_fast_title
 
 
 class MessagingService:
-    def __init__(self, db: Session, vdb: VectorDBBase, user_id: str):
+    """
+    Every repository call runs in its own short-lived session so that no database
+    connection is held while the LLM and the VDB are being awaited.
+    """
+
+    def __init__(
+        self,
+        vdb: Optional[VectorDBBase],
+        user_id: str,
+        verdict_worker_pool: Optional[BoundedWorkerPool] = None,
+        title_worker_pool: Optional[BoundedWorkerPool] = None
+    ):
         self.user_id = user_id
-        self.conversation_repository = ConversationRepository(db)
-        self.message_repository = MessageRepository(db)
-        self.threat_repository = ThreatIndicatorRepository(db)
         self.vdb = vdb
-    
+        self.verdict_worker_pool = verdict_worker_pool
+        self.title_worker_pool = title_worker_pool
+
     async def send_message(
         self,
         user_msg_data: MessageCreate,
@@ -32,139 +52,419 @@ class MessagingService:
         adversary_agent: AdversaryBase
     ) -> AsyncGenerator[str, None]:
         try:
-            recent_messages = self.message_repository.load_recent_messages(user_msg_data.conversation_id, 20)
-            new_conversation = len(recent_messages) == 0
-            recent_messages = format_messages_to_history(recent_messages)
+            async with async_session_scope() as db:
+                recent_messages = await AsyncMessageRepository(db).load_recent_messages(user_msg_data.conversation_id, 20)
+                new_conversation = len(recent_messages) == 0
+                recent_messages = format_messages_to_history(recent_messages)
 
-            # agent stream response initialization
-            response_iterator = adversary_agent.respond(user_msg_data.content, recent_messages)
-            response_text = ""    
-
-            for chunk in response_iterator:
-                response_text += chunk
-                yield StreamResponseData(
-                    type="ai-response",
-                    data=chunk
-                ).model_dump_json()
-            
-            # setup conversation update
-            def update_conversation():
-                update_attr = ConversationUpdate()
-                if new_conversation:
-                    update_attr.title = protection_agent.generate_conversation_title(user_msg_data.content)
-                updated_conversation = self.conversation_repository.update_conversation(
-                    user_msg_data.conversation_id,
-                    update_attr
+            protection_conversation = recent_messages + f"User: {user_msg_data.content}\n"
+
+            verdict_monitor = None
+            if settings.STREAMING_PROTECTION_ENABLED:
+                verdict_monitor = StreamingVerdictMonitor(
+                    protection_agent,
+                    protection_conversation,
+                    checkpoint=settings.STREAMING_PROTECTION_CHECKPOINT,
+                    token_interval=settings.STREAMING_PROTECTION_TOKEN_INTERVAL,
+                    min_chars=settings.STREAMING_PROTECTION_MIN_CHARS
                 )
-                return  updated_conversation
-            
-            update_title_thread = to_thread(update_conversation)
-            
-            # insert user msg
-            inserted_user_msg = self.message_repository.create_message(user_msg_data, "user")
-            schema_format_user_msg = Message.model_validate(inserted_user_msg)
-            yield StreamResponseData(
-                type="user-msg",
-                data=schema_format_user_msg
-            ).model_dump_json()
+
+            # agent stream response initialization
+            response_text = ""
+            verdict = None
+
+            async with aclosing(adversary_agent.arespond(user_msg_data.content, recent_messages)) as response_iterator:
+                async for chunk in response_iterator:
+                    response_text += chunk
+                    yield StreamResponseData(
+                        type="ai-response",
+                        data=chunk
+                    ).model_dump_json()
+
+                    if not verdict_monitor:
+                        continue
+
+                    verdict_monitor.feed(chunk)
+                    provisional_verdict = verdict_monitor.poll()
+                    if provisional_verdict and provisional_verdict.is_malicious:
+                        yield StreamResponseData(
+                            type="malicious-verdict",
+                            data=provisional_verdict,
+                            provisional=True
+                        ).model_dump_json()
+
+                        # stop generating once the threat is confirmed
+                        if settings.STREAMING_PROTECTION_ABORT_ON_THREAT:
+                            verdict = provisional_verdict
+                            break
+
+            if verdict_monitor:
+                # reuse a check that already covered the whole reply, unless the verdict needs the RAG context
+                if verdict is None and not user_msg_data.rag_enabled:
+                    verdict = await verdict_monitor.finalize(response_text)
+                await verdict_monitor.close()
 
             adversary_message = MessageCreate(
-                conversation_id=inserted_user_msg.conversation_id,
-                agent_model=inserted_user_msg.agent_model,
-                model = inserted_user_msg.model,
-                rag_enabled=inserted_user_msg.rag_enabled,
+                conversation_id=user_msg_data.conversation_id,
+                agent_model=user_msg_data.agent_model,
+                model = user_msg_data.model,
+                rag_enabled=user_msg_data.rag_enabled,
                 type="text",
                 content=response_text,
                 img_url=None
             )
 
-            inserted_adversary_msg = self.message_repository.create_message(adversary_message, "assistant")
-            schema_format_adversary_msg = Message.model_validate(inserted_adversary_msg)
+            # a local title right away, the LLM title replaces it in the background
+            conversation_title = None
+            if new_conversation:
+                conversation_title = generate_fast_title(user_msg_data.content, max_words=settings.TITLE_MAX_WORDS)
+
+            if verdict is None and user_msg_data.deferred_verdict and self.verdict_worker_pool:
+                async for event in self._send_with_deferred_verdict(
+                    user_msg_data,
+                    adversary_message,
+                    protection_agent,
+                    protection_conversation,
+                    conversation_title
+                ):
+                    yield event
+                return
+
+            index_threat = True
+            if verdict is None:
+                protection_service = ProtectionService(protection_agent, self.vdb)
+                verdict = await protection_service.get_verdict(
+                    response_text,
+                    protection_conversation,
+                    rag_enabled=user_msg_data.rag_enabled,
+                    user_id=self.user_id,
+                    conversation_id=str(user_msg_data.conversation_id) if user_msg_data.conversation_id else None
+                )
+                index_threat = protection_service.verdict_is_indexable
+
+            # both messages, the threat, its vdb outbox entry and the conversation bump are committed together
+            async with async_session_scope() as db:
+                inserted_user_msg, inserted_adversary_msg, updated_conversation, threat = await AsyncMessageExchangeRepository(db).create_exchange(
+                    user_msg_data,
+                    adversary_message,
+                    conversation_title=conversation_title,
+                    threat_description=verdict.explanation,
+                    is_malicious=verdict.is_malicious,
+                    index_threat=index_threat,
+                    user_id=self.user_id
+                )
+                schema_format_user_msg = Message.model_validate(inserted_user_msg)
+                schema_format_adversary_msg = Message.model_validate(inserted_adversary_msg)
+                format_updated_conversation = Conversation.model_validate(updated_conversation)
+                schema_format_threat = ThreatResponse.model_validate(threat)
+
+            if conversation_title:
+                self._submit_title_refinement(protection_agent, format_updated_conversation, user_msg_data.content)
+
+            yield StreamResponseData(
+                type="user-msg",
+                data=schema_format_user_msg
+            ).model_dump_json()
+
             yield StreamResponseData(
                 type="ai-msg",
                 data=schema_format_adversary_msg
             ).model_dump_json()
 
-            updated_conversation = await update_title_thread
-            format_updated_conversation = Conversation.model_validate(updated_conversation)
             yield StreamResponseData(
                 type="new-conversation",
                 data=format_updated_conversation
             ).model_dump_json()
 
-            recent_messages += f"User: {user_msg_data.content}\n"
-            
-            # check if rag is enabled
-            relevant_msgs_str = None
-            if user_msg_data.rag_enabled:
-                relevant_msgs_str = self.vdb.search_points(response_text)
-            
-            verdict = protection_agent.process_message(response_text, recent_messages, relevant_msgs_str)
+            yield StreamResponseData(
+                type="malicious-verdict",
+                data=schema_format_threat
+            ).model_dump_json()
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create message: {str(e)}"
+            )
+
+    async def _send_with_deferred_verdict(
+        self,
+        user_msg_data: MessageCreate,
+        adversary_message: MessageCreate,
+        protection_agent: ProtectionAgentBase,
+        protection_conversation: str,
+        conversation_title: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Persist the exchange without a verdict and hand the verdict over to the
+        verdict worker pool. The result is published to the user's event stream and can be
+        polled by message id. A saturated pool computes the verdict inline instead.
+        """
+        async with async_session_scope() as db:
+            inserted_user_msg, inserted_adversary_msg, updated_conversation, _ = await AsyncMessageExchangeRepository(db).create_exchange(
+                user_msg_data,
+                adversary_message,
+                conversation_title=conversation_title,
+                user_id=self.user_id
+            )
+            schema_format_user_msg = Message.model_validate(inserted_user_msg)
+            schema_format_adversary_msg = Message.model_validate(inserted_adversary_msg)
+            format_updated_conversation = Conversation.model_validate(updated_conversation)
 
-            message_to_vdb_thread = None
-            if verdict.is_malicious: # if malicious, insert to vdb
-                message_to_vdb_thread = to_thread(self.vdb.insert_point, inserted_adversary_msg.content, str(inserted_adversary_msg.id))
+        if conversation_title:
+            self._submit_title_refinement(protection_agent, format_updated_conversation, user_msg_data.content)
 
-            threat = self.threat_repository.create_threat(inserted_adversary_msg.id, verdict.explanation)
-            schema_format_threat = ThreatResponse.model_validate(threat)
+        yield StreamResponseData(
+            type="user-msg",
+            data=schema_format_user_msg
+        ).model_dump_json()
 
+        verdict_job = partial(
+            self._complete_deferred_verdict,
+            protection_agent,
+            schema_format_adversary_msg,
+            protection_conversation
+        )
+        if self.verdict_worker_pool.submit(verdict_job):
             yield StreamResponseData(
-                type="malicious-verdict",
-                data=schema_format_threat
+                type="ai-msg",
+                data=schema_format_adversary_msg
             ).model_dump_json()
 
-            if message_to_vdb_thread:
-                await message_to_vdb_thread
+            yield StreamResponseData(
+                type="new-conversation",
+                data=format_updated_conversation
+            ).model_dump_json()
+
+            yield StreamResponseData(
+                type="verdict-pending",
+                data=str(schema_format_adversary_msg.id)
+            ).model_dump_json()
+            return
+
+        schema_format_threat = await verdict_job()
+        schema_format_adversary_msg.threat_indicator = schema_format_threat
+
+        yield StreamResponseData(
+            type="ai-msg",
+            data=schema_format_adversary_msg
+        ).model_dump_json()
+
+        yield StreamResponseData(
+            type="new-conversation",
+            data=format_updated_conversation
+        ).model_dump_json()
+
+        yield StreamResponseData(
+            type="malicious-verdict",
+            data=schema_format_threat
+        ).model_dump_json()
+
+    async def _complete_deferred_verdict(
+        self,
+        protection_agent: ProtectionAgentBase,
+        adversary_msg: Message,
+        protection_conversation: str
+    ) -> ThreatResponse:
+        """
+        Verdict job of the deferred mode.
+        """
+        try:
+            protection_service = ProtectionService(protection_agent, self.vdb)
+            verdict = await protection_service.get_verdict(
+                adversary_msg.content,
+                protection_conversation,
+                rag_enabled=adversary_msg.rag_enabled,
+                user_id=self.user_id,
+                conversation_id=str(adversary_msg.conversation_id)
+            )
+
+            async with async_session_scope() as db:
+                threat = await AsyncMessageExchangeRepository(db).create_deferred_verdict(
+                    adversary_msg.id,
+                    adversary_msg.content,
+                    adversary_msg.conversation_id,
+                    verdict.explanation,
+                    is_malicious=verdict.is_malicious,
+                    index_threat=protection_service.verdict_is_indexable,
+                    user_id=self.user_id
+                )
+                schema_format_threat = ThreatResponse.model_validate(threat)
+
+        except Exception as e:
+            # without a stored failure, pollers of the verdict would wait forever
+            try:
+                async with async_session_scope() as db:
+                    await AsyncMessageRepository(db).mark_verdict_failed(adversary_msg.id, str(e))
+            except Exception as store_error:
+                print(f"Failed storing the verdict error of {adversary_msg.id}: {store_error}")
+
+            event_broker.publish(self.user_id, StreamResponseData(
+                type="verdict-error",
+                data=str(adversary_msg.id)
+            ).model_dump_json())
+            raise
+
+        event_broker.publish(self.user_id, StreamResponseData(
+            type="malicious-verdict",
+            data=schema_format_threat
+        ).model_dump_json())
+
+        return schema_format_threat
+
+    def _submit_title_refinement(
+        self,
+        protection_agent: ProtectionAgentBase,
+        conversation: Conversation,
+        user_prompt: str
+    ):
+        """
+        Queue the LLM title of a new conversation. A disabled or saturated title pool
+        simply keeps the local title.
+        """
+        if not settings.LLM_TITLE_ENABLED or not self.title_worker_pool:
+            return
+
+        self.title_worker_pool.submit(partial(
+            self._refine_conversation_title,
+            protection_agent,
+            conversation.id,
+            conversation.title,
+            user_prompt
+        ))
+
+    async def _refine_conversation_title(
+        self,
+        protection_agent: ProtectionAgentBase,
+        conversation_id,
+        fast_title: str,
+        user_prompt: str
+    ):
+        """
+        Title job: replace the local title with the LLM title, unless the conversation was
+        renamed in the meantime, and publish the updated conversation to the user's event stream.
+        """
+        llm_title = (await protection_agent.agenerate_conversation_title(user_prompt) or "").strip().strip('"')
+        if not llm_title or llm_title == fast_title:
+            return
+
+        async with async_session_scope() as db:
+            updated_conversation = await AsyncConversationRepository(db).replace_title(conversation_id, fast_title, llm_title)
+            if not updated_conversation:
+                return
+            format_updated_conversation = Conversation.model_validate(updated_conversation)
+
+        event_broker.publish(self.user_id, StreamResponseData(
+            type="conversation-title",
+            data=format_updated_conversation
+        ).model_dump_json())
+
+    async def get_message_verdict(
+        self,
+        message_id: str
+    ) -> VerdictStatus:
+        try:
+            async with async_session_scope() as db:
+                curr_msg = await AsyncMessageRepository(db).get_message_by_id(message_id)
+                if not curr_msg:
+                    raise NotFoundException(detail="message does not exist")
+
+                curr_cnv = await AsyncConversationRepository(db).get_conversation(curr_msg.conversation_id)
+                if str(curr_cnv.user_id) != self.user_id:
+                    raise ForbiddenException(detail="invalid owner of the message")
+
+                threat = await AsyncThreatIndicatorRepository(db).get_threat_by_msg_id(curr_msg.id)
+                if not threat:
+                    return VerdictStatus(message_id=curr_msg.id, status="failed" if curr_msg.verdict_error else "pending")
+
+                return VerdictStatus(
+                    message_id=curr_msg.id,
+                    status="completed",
+                    threat=ThreatResponse.model_validate(threat)
+                )
+
+        except AppExceptionBase as e:
+            raise e
 
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create message: {str(e)}"
+                detail=f"Failed to load the verdict: {str(e)}"
             )
-    
-    def load_messages_by_conversation(
+
+    async def stream_events(self) -> AsyncGenerator[str, None]:
+        """
+        Server-sent events of the user (deferred verdicts, conversation updates), with
+        comment heartbeats to keep idle connections open.
+        """
+        queue = event_broker.subscribe(self.user_id)
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                yield f"data: {event}\n\n"
+
+        finally:
+            event_broker.unsubscribe(self.user_id, queue)
+
+    async def load_messages_by_conversation(
         self,
         conversation_id: str
-    ):
+    ) -> List[Message]:
         try:
-            # load the conversation
-            curr_convo = self.conversation_repository.get_conversation(conversation_id)
+            async with async_session_scope() as db:
+                # load the conversation
+                curr_convo = await AsyncConversationRepository(db).get_conversation(conversation_id)
 
-            if not curr_convo:
-                raise NotFoundException(detail="conversation does not exist")
+                if not curr_convo:
+                    raise NotFoundException(detail="conversation does not exist")
 
-            if str(curr_convo.user_id) != self.user_id:
-                raise ForbiddenException("invalid conversation owner")
-        
-            return self.message_repository.load_messages_by_convo_id(curr_convo.id)
+                if str(curr_convo.user_id) != self.user_id:
+                    raise ForbiddenException("invalid conversation owner")
+
+                messages = await AsyncMessageRepository(db).load_messages_by_convo_id(curr_convo.id)
+                return [Message.model_validate(message) for message in messages]
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to load messages: {str(e)}"
             )
 
-    def change_message_threat_status(
+    async def change_message_threat_status(
         self,
         message_id: str
     ):
         try:
-            curr_msg = self.message_repository.get_message_by_id(message_id)
-            if not curr_msg:
-                raise NotFoundException(detail="message does not exist")
-
-            curr_cnv = self.conversation_repository.get_conversation(curr_msg.conversation_id)
-            if self.user_id != curr_cnv.user_id:
-                raise ForbiddenException(detail="invalid owner of the message")
-            
-            # update the threat
-            updated_threat = self.threat_repository.update_threat_status_by_msg_id(curr_msg.id)
-
-            if not updated_threat.is_threat: # remove from vdb
-                self.vdb.delete_points(updated_threat.message_id)
-            
+            async with async_session_scope() as db:
+                curr_msg = await AsyncMessageRepository(db).get_message_by_id(message_id)
+                if not curr_msg:
+                    raise NotFoundException(detail="message does not exist")
+
+                curr_cnv = await AsyncConversationRepository(db).get_conversation(curr_msg.conversation_id)
+                if str(curr_cnv.user_id) != self.user_id:
+                    raise ForbiddenException(detail="invalid owner of the message")
+
+                # update the threat and queue the matching vdb change in the same transaction
+                updated_threat = await AsyncThreatIndicatorRepository(db).update_threat_status_by_msg_id(curr_msg.id, commit=False)
+                outbox_repository = AsyncVdbOutboxRepository(db)
+                if updated_threat.is_threat:
+                    outbox_repository.enqueue_upsert(
+                        curr_msg.id,
+                        curr_msg.content,
+                        user_id=curr_cnv.user_id,
+                        conversation_id=curr_cnv.id
+                    )
+                else:
+                    outbox_repository.enqueue_delete(curr_msg.id)
+                await db.commit()
+
         except AppExceptionBase as e:
             raise e
-        
+
         except Exception as e:
             print(f"Failed changing threat: {e}")
             raise HTTPException(
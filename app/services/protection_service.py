@@ -0,0 +1,269 @@
+from collections import Counter, deque
+from typing import Awaitable, Dict, List, Optional, TypeVar
+import asyncio
+import math
+import time
+
+from app.core.config import settings
+from app.core.database import async_session_scope
+from app.repositories.threat_indicator_repository import AsyncThreatIndicatorRepository
+from app.schemas.protection_schema import ProtectionResponse
+from app.schemas.vdb_schema import SimilarPointSchema
+from app.infrastructures.protection_agent.base import ProtectionAgentBase
+from app.infrastructures.protection_agent.verdict_cache import get_verdict_cache
+from app.infrastructures.protection_agent.batching import get_batching_engine
+from app.infrastructures.protection_agent.heuristics import HeuristicPreFilter, CONFIDENT_MALICIOUS
+from app.infrastructures.vdb.base import VectorDBBase
+
+
+class ProtectionTierStats:
+    """
+    Counts which tier produced each verdict.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def record(self, tier: str):
+        self.counts[tier] += 1
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        return {
+            "total": total,
+            "tiers": {
+                tier: {"count": count, "share": count / total}
+                for tier, count in self.counts.items()
+            },
+        }
+
+
+class ProtectionStageStats:
+    """
+    Latency of each protection pipeline stage over the most recent verdicts.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.counts = Counter()
+
+    def record(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, deque(maxlen=self.window)).append(seconds * 1000)
+        self.counts[stage] += 1
+
+    def stats(self) -> dict:
+        return {
+            "stages": {
+                stage: {
+                    "count": self.counts[stage],
+                    "avg_ms": sum(samples) / len(samples),
+                    "p50_ms": self._percentile(samples, 50),
+                    "p95_ms": self._percentile(samples, 95),
+                    "max_ms": max(samples),
+                }
+                for stage, samples in self.samples.items()
+            },
+        }
+
+    @staticmethod
+    def _percentile(samples, p: float) -> float:
+        ordered = sorted(samples)
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+protection_tier_stats = ProtectionTierStats()
+protection_stage_stats = ProtectionStageStats()
+
+T = TypeVar("T")
+
+pre_filter = HeuristicPreFilter(
+    malicious_threshold=settings.PREFILTER_MALICIOUS_THRESHOLD,
+    extra_phishing_domains=settings.PREFILTER_PHISHING_DOMAINS
+)
+
+
+class ProtectionService:
+    """
+    Produces the verdict of an adversary message, only reaching the protection agent
+    when no cheaper tier can answer. Independent stages of the agent tier run concurrently.
+    """
+
+    def __init__(self, protection_agent: ProtectionAgentBase, vdb: VectorDBBase):
+        self.protection_agent = protection_agent
+        self.vdb = vdb
+        self.verdict_cache = get_verdict_cache()
+        # seconds spent in each pipeline stage of the last verdict
+        self.stage_timings: Dict[str, float] = {}
+        # tier that produced the last verdict
+        self.verdict_tier: Optional[str] = None
+
+    async def get_verdict(
+        self,
+        message: str,
+        conversation: str,
+        rag_enabled: bool = False,
+        user_id: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> ProtectionResponse:
+        self.stage_timings = {}
+        self.verdict_tier = None
+
+        if settings.PREFILTER_ENABLED:
+            pre_filter_result = pre_filter.classify(message)
+            if pre_filter_result.verdict == CONFIDENT_MALICIOUS:
+                self._record_tier("prefilter-malicious")
+                return ProtectionResponse(
+                    is_malicious=True,
+                    explanation=(
+                        f"This message was flagged as malicious because it contains {', '.join(pre_filter_result.reasons)}. "
+                        "Do not open its links, share personal information or send money, and block the sender if in doubt."
+                    )
+                )
+
+        cache_key = None
+        if self.verdict_cache:
+            cache_key = self.verdict_cache.build_key(
+                message,
+                self.protection_agent.guidelines,
+                self.protection_agent.model,
+                conversation
+            )
+            cached_verdict = await self.verdict_cache.get(cache_key)
+            if cached_verdict:
+                self._record_tier("cache")
+                return cached_verdict
+
+        # the RAG lookup and the image stages (tool selection, then image analysis) do not depend
+        # on each other, only the final verdict waits for both
+        search_task = None
+        if rag_enabled or settings.SEMANTIC_VERDICT_ENABLED:
+            search_task = asyncio.create_task(
+                self._timed("rag_search", self._search_similar(message, user_id, conversation_id))
+            )
+        image_task = asyncio.create_task(self._describe_images(message))
+
+        try:
+            similar_points = []
+            if search_task:
+                # the semantic tier and the RAG context are optional, a VDB or embedding outage
+                # must not fail the verdict
+                try:
+                    similar_points = await search_task
+                except Exception as e:
+                    print(f"Similar threat search failed, continuing without it: {e}")
+
+            verdict = None
+            if settings.SEMANTIC_VERDICT_ENABLED:
+                verdict = await self._timed("semantic", self._get_semantic_verdict(similar_points))
+                if verdict:
+                    self._record_tier("semantic")
+
+            if verdict is None:
+                self._record_tier("llm")
+                # check if rag is enabled
+                relevant_msgs_str = None
+                if rag_enabled:
+                    relevant_msgs_str = self.vdb.format_similar_points(similar_points)
+
+                image_desc = await image_task
+                content = self.protection_agent.build_verdict_content(message, conversation, relevant_msgs_str, image_desc)
+
+                batching_engine = get_batching_engine(self.protection_agent)
+                verdict = await self._timed(
+                    "verdict",
+                    batching_engine.aprocess_content(content) if batching_engine else self.protection_agent.aprocess_content(content)
+                )
+
+        finally:
+            # a semantic verdict or a failure makes the pending stages useless
+            for task in (search_task, image_task):
+                if task and not task.done():
+                    task.cancel()
+                elif task and not task.cancelled():
+                    # failures of skipped stages are expected, mark them as retrieved
+                    task.exception()
+
+        if self.verdict_cache:
+            await self.verdict_cache.set(cache_key, verdict)
+
+        return verdict
+
+    @property
+    def verdict_is_indexable(self) -> bool:
+        """
+        Whether the last verdict may be stored in the VDB. Pre-filter verdicts are templated
+        heuristics, indexing them would let the semantic tier spread their false positives.
+        """
+        return self.verdict_tier != "prefilter-malicious"
+
+    def _record_tier(self, tier: str):
+        self.verdict_tier = tier
+        protection_tier_stats.record(tier)
+
+    async def _describe_images(self, message: str) -> Optional[str]:
+        img_urls = await self._timed("tool_selection", self.protection_agent.aselect_image_urls(message))
+        return await self._timed("image_analysis", self.protection_agent.aanalyze_images(img_urls))
+
+    async def _timed(self, stage: str, awaitable: Awaitable[T]) -> T:
+        """
+        Await a pipeline stage and record its duration, cancelled stages are not recorded.
+        """
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._record_stage(stage, time.perf_counter() - started)
+            raise
+
+        self._record_stage(stage, time.perf_counter() - started)
+        return result
+
+    def _record_stage(self, stage: str, seconds: float):
+        self.stage_timings[stage] = seconds
+        protection_stage_stats.record(stage, seconds)
+
+    async def _search_similar(
+        self,
+        message: str,
+        user_id: Optional[str],
+        conversation_id: Optional[str]
+    ) -> List[SimilarPointSchema]:
+        """
+        Search the stored threats within VDB_SEARCH_SCOPE.
+        """
+        if settings.VDB_SEARCH_SCOPE == "user":
+            if not user_id:
+                return []
+            return await self.vdb.asearch_similar(message, user_id=user_id)
+
+        if settings.VDB_SEARCH_SCOPE == "conversation":
+            if not conversation_id:
+                return []
+            return await self.vdb.asearch_similar(message, conversation_id=conversation_id)
+
+        return await self.vdb.asearch_similar(message)
+
+    async def _get_semantic_verdict(self, similar_points: List[SimilarPointSchema]) -> Optional[ProtectionResponse]:
+        """
+        Reuse the stored explanation of a confirmed threat that is a near-duplicate of the message.
+        Borderline scores return None and are left to the protection agent.
+        """
+        near_duplicates = sorted(
+            (point for point in similar_points if point.score >= settings.SEMANTIC_VERDICT_THRESHOLD),
+            key=lambda point: point.score,
+            reverse=True
+        )
+        if not near_duplicates:
+            return None
+
+        async with async_session_scope() as db:
+            threat_repository = AsyncThreatIndicatorRepository(db)
+            for point in near_duplicates:
+                threat = await threat_repository.get_threat_by_msg_id(point.message_id)
+                if threat and threat.is_threat:
+                    return ProtectionResponse(is_malicious=True, explanation=threat.description)
+
+        return None
@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Tuple
+from asyncio import to_thread
+import asyncio
+
+from app.core.config import settings
+from app.core.database import async_session_scope
+from app.models.vdb_outbox import VdbOutbox
+from app.repositories.vdb_outbox_repository import AsyncVdbOutboxRepository, UPSERT, DELETE
+from app.schemas.vdb_schema import PointPayloadSchema
+from app.infrastructures.embedding.embedding_cache import aembed_texts_cached
+from app.infrastructures.vdb.base import VectorDBBase
+
+
+class VdbOutboxWorker:
+    """
+    Drains the VdbOutbox table in the background. Each batch is applied with one embedding
+    call, one upsert and one delete; failed entries stay in the table and are retried with
+    exponential backoff, so a VDB outage delays threats instead of losing them. An entry is
+    only deleted once the VDB has flushed it.
+    """
+
+    def __init__(self, vdb: VectorDBBase):
+        self.vdb = vdb
+        self.batch_size = settings.VDB_OUTBOX_BATCH_SIZE
+        self.poll_interval = settings.VDB_OUTBOX_POLL_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                processed = await self.drain_once()
+            except Exception as e:
+                print(f"VDB outbox worker failed: {e}")
+                processed = 0
+
+            # keep draining while there is a backlog, otherwise wait for new entries
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def drain_once(self) -> int:
+        """
+        Apply one batch of due entries, returns the number of entries claimed.
+
+        The entries are claimed in a first short transaction, applied without holding a
+        connection, then deleted or rescheduled in a second short transaction. A message with
+        claimed entries is skipped by the other workers until they are released.
+        """
+        async with async_session_scope() as db:
+            outbox_repository = AsyncVdbOutboxRepository(db)
+            entries = await outbox_repository.claim_due_entries(self.batch_size, settings.VDB_OUTBOX_CLAIM_TIMEOUT)
+            if not entries:
+                return 0
+
+            # only the latest operation of a message matters, in this batch and in the table
+            superseded = await outbox_repository.get_superseded_entries(entries)
+            superseded_ids = {entry.id for entry in superseded}
+            latest_entries: Dict[str, VdbOutbox] = {}
+            for entry in entries:
+                if entry.id in superseded_ids:
+                    continue
+                previous = latest_entries.get(str(entry.message_id))
+                if previous is not None:
+                    superseded.append(previous)
+                latest_entries[str(entry.message_id)] = entry
+
+            await outbox_repository.delete_entries([entry.id for entry in superseded])
+            await db.commit()
+
+        upserts = [entry for entry in latest_entries.values() if entry.operation == UPSERT]
+        deletes = [entry for entry in latest_entries.values() if entry.operation == DELETE]
+
+        succeeded: List[VdbOutbox] = []
+        failed: List[Tuple[List[VdbOutbox], str]] = []
+        for batch, apply in ((upserts, self._apply_upserts), (deletes, self._apply_deletes)):
+            if not batch:
+                continue
+            try:
+                await apply(batch)
+                succeeded.extend(batch)
+            except Exception as e:
+                print(f"VDB outbox {batch[0].operation} of {len(batch)} entries failed: {e}")
+                failed.append((batch, str(e)))
+
+        if succeeded:
+            try:
+                # the rows are the only durable copy until an in-process store is saved
+                await to_thread(self.vdb.flush)
+            except Exception as e:
+                print(f"VDB outbox flush failed: {e}")
+                failed.append((succeeded, str(e)))
+                succeeded = []
+
+        async with async_session_scope() as db:
+            outbox_repository = AsyncVdbOutboxRepository(db)
+            await outbox_repository.delete_applied_entries(succeeded)
+            for batch, error in failed:
+                await outbox_repository.reschedule_entries(
+                    batch,
+                    error=error,
+                    base_backoff=settings.VDB_OUTBOX_BACKOFF_BASE,
+                    max_backoff=settings.VDB_OUTBOX_MAX_BACKOFF
+                )
+            await db.commit()
+
+        return len(entries)
+
+    async def _apply_upserts(self, entries: List[VdbOutbox]):
+        vectors = await aembed_texts_cached([entry.content for entry in entries])
+        payloads = [
+            PointPayloadSchema(
+                message_id=str(entry.message_id),
+                content=entry.content,
+                user_id=str(entry.user_id) if entry.user_id else None,
+                conversation_id=str(entry.conversation_id) if entry.conversation_id else None
+            )
+            for entry in entries
+        ]
+        await to_thread(self.vdb.add_vectors, vectors, payloads)
+
+    async def _apply_deletes(self, entries: List[VdbOutbox]):
+        await to_thread(self.vdb.delete_points_batch, [str(entry.message_id) for entry in entries])
@@ -0,0 +1,78 @@
+from typing import Any, Awaitable, Callable, Hashable, List, Optional, Set, Tuple
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Collects items submitted by concurrent callers for up to max_wait seconds (or until
+    max_batch_size items are pending), processes them with a single process_fn call and fans
+    the results back out to each caller. Identical items of a batch are processed once.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[List[Hashable]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.01
+    ):
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Hashable, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running_flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Hashable) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_now()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+
+    async def _flush_after_wait(self):
+        await asyncio.sleep(self.max_wait)
+        self._flush_task = None
+        await self._flush(self._take_pending())
+
+    def _flush_now(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        flush = asyncio.create_task(self._flush(self._take_pending()))
+        self._running_flushes.add(flush)
+        flush.add_done_callback(self._running_flushes.discard)
+
+    def _take_pending(self) -> List[Tuple[Hashable, asyncio.Future]]:
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_wait())
+        return batch
+
+    async def _flush(self, batch: List[Tuple[Hashable, asyncio.Future]]):
+        if not batch:
+            return
+
+        unique_items = list(dict.fromkeys(item for item, _ in batch))
+        try:
+            results = await self.process_fn(unique_items)
+            if len(results) != len(unique_items):
+                raise ValueError(f"Expected {len(unique_items)} results, got {len(results)}")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # process_fn may return an exception for a single item, it is raised to that caller only
+        results_by_item = dict(zip(unique_items, results))
+        for item, future in batch:
+            if future.done():
+                continue
+            if isinstance(results_by_item[item], BaseException):
+                future.set_exception(results_by_item[item])
+            else:
+                future.set_result(results_by_item[item])
@@ -0,0 +1,62 @@
+import re
+
+
+DEFAULT_TITLE = "New conversation"
+
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+CLAUSE_BOUNDARY_PATTERN = re.compile(r"[.!?;:\n]+|,\s+(?:but|so|and|because)\s+", re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[\w'-]+", re.UNICODE)
+
+# openings that say nothing about the topic, longest first so "can you please" wins over "can you"
+FILLER_PREFIXES = sorted((
+    "hi", "hello", "hey", "yo", "good morning", "good afternoon", "good evening", "dear",
+    "please", "pls", "can you", "can you please", "could you", "could you please",
+    "would you", "i want to", "i would like to", "i'd like to", "i need to", "i need you to",
+    "help me", "tell me", "so", "ok", "okay", "um", "well", "there", "everyone", "guys",
+), key=len, reverse=True)
+
+SMALL_WORDS = {"a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "for", "by", "with", "from"}
+
+
+def generate_fast_title(text: str, max_words: int = 8, max_chars: int = 60) -> str:
+    """
+    Extractive conversation title: the first meaningful clause of the message, without
+    links and greetings, cut to max_words words and title-cased.
+    """
+    text = URL_PATTERN.sub(" ", text or "")
+
+    for clause in CLAUSE_BOUNDARY_PATTERN.split(text):
+        words = _strip_filler(WORD_PATTERN.findall(clause))
+        if words:
+            break
+    else:
+        return DEFAULT_TITLE
+
+    title = _title_case(words[:max_words])
+    if len(title) > max_chars:
+        title = title[:max_chars].rsplit(" ", 1)[0] or title[:max_chars]
+
+    return title
+
+
+def _strip_filler(words: list) -> list:
+    stripped = True
+    while words and stripped:
+        stripped = False
+        lowered = " ".join(words).lower()
+        for prefix in FILLER_PREFIXES:
+            if lowered == prefix or lowered.startswith(f"{prefix} "):
+                words = words[len(prefix.split()):]
+                stripped = True
+                break
+
+    return words
+
+
+def _title_case(words: list) -> str:
+    return " ".join(
+        word if word.isupper() and len(word) > 1
+        else word.lower() if i > 0 and word.lower() in SMALL_WORDS
+        else word[:1].upper() + word[1:]
+        for i, word in enumerate(words)
+    )
@@ -0,0 +1,73 @@
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+
+
+class BoundedWorkerPool:
+    """
+    Fixed number of asyncio workers consuming a bounded job queue. submit never waits,
+    a full queue rejects the job so that callers can fall back to doing the work inline.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue_size: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._max_queue_size = max_queue_size
+        self._workers: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        """
+        Let the queued jobs finish, then stop the workers.
+        """
+        if not self._workers:
+            return
+
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, job: Callable[[], Awaitable]) -> bool:
+        if not self._workers:
+            self.rejected += 1
+            return False
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+
+        return True
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"{self.name} job failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,106 @@
+"""
+Compare requests/sec of the conversation and message read endpoints when the
+repositories run on the sync engine (blocking the event loop) versus the async engine.
+
+Both variants are mounted in-process on the same FastAPI app and driven through the
+ASGI transport, so only the database access path differs. DATABASE_URL must point to a
+database holding at least one conversation of the given user.
+
+Usage:
+    python -m benchmarks.read_endpoints_benchmark --user-id <uuid> --conversation-id <uuid> \
+        --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, get_async_db, engine, async_engine
+from app.repositories.conversation_repository import ConversationRepository, AsyncConversationRepository
+from app.repositories.message_repository import MessageRepository, AsyncMessageRepository
+from app.schemas.conversation_schema import Conversation
+from app.schemas.message_schema import Message
+
+
+def create_benchmark_app(user_id: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/conversation/")
+    async def sync_conversations(db: Session = Depends(get_db)):
+        conversations = ConversationRepository(db).get_user_conversations(user_id)
+        return [Conversation.model_validate(c) for c in conversations]
+
+    @app.get("/async/conversation/")
+    async def async_conversations(db: AsyncSession = Depends(get_async_db)):
+        conversations = await AsyncConversationRepository(db).get_user_conversations(user_id)
+        return [Conversation.model_validate(c) for c in conversations]
+
+    @app.get("/sync/message/")
+    async def sync_messages(conversation_id: str, db: Session = Depends(get_db)):
+        messages = MessageRepository(db).load_messages_by_convo_id(conversation_id)
+        return [Message.model_validate(m) for m in messages]
+
+    @app.get("/async/message/")
+    async def async_messages(conversation_id: str, db: AsyncSession = Depends(get_async_db)):
+        messages = await AsyncMessageRepository(db).load_messages_by_convo_id(conversation_id)
+        return [Message.model_validate(m) for m in messages]
+
+    return app
+
+
+async def run_load(client: httpx.AsyncClient, path: str, concurrency: int, n_requests: int) -> float:
+    remaining = n_requests
+    failures = 0
+
+    async def worker():
+        nonlocal remaining, failures
+        while remaining > 0:
+            remaining -= 1
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    if failures:
+        print(f"  {failures} failed requests on {path}")
+    return n_requests / elapsed
+
+
+async def main(args):
+    app = create_benchmark_app(args.user_id)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        paths = {
+            "GET /conversation/": "conversation/",
+            "GET /message/": f"message/?conversation_id={args.conversation_id}",
+        }
+
+        print(f"concurrency={args.concurrency} requests={args.requests}")
+        for name, path in paths.items():
+            # warm up both pools before measuring
+            await run_load(client, f"/sync/{path}", args.concurrency, args.concurrency)
+            await run_load(client, f"/async/{path}", args.concurrency, args.concurrency)
+
+            sync_rps = await run_load(client, f"/sync/{path}", args.concurrency, args.requests)
+            async_rps = await run_load(client, f"/async/{path}", args.concurrency, args.requests)
+            print(f"{name:<20} sync: {sync_rps:8.1f} req/s   async: {async_rps:8.1f} req/s   x{async_rps / sync_rps:.2f}")
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--conversation-id", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
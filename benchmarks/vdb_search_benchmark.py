@@ -0,0 +1,136 @@
+"""
+Measure recall@k and search latency of the Qdrant threat collection settings on a synthetic
+collection. Recall is measured against Qdrant's exact (brute-force) search of the same collection.
+
+The collection is created with QdrantVDB.collection_options and searched with
+QdrantVDB.search_params, so the QDRANT COLLECTION settings under test are set through the
+environment.
+
+Usage:
+    QDRANT_QUANTIZATION=scalar QDRANT_HNSW_EF_SEARCH=64 \
+        python -m benchmarks.vdb_search_benchmark --points 100000 --queries 500 --k 10
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from qdrant_client.http.models import PointStruct, SearchParams, CollectionStatus
+
+from app.core.config import settings
+from app.infrastructures.vdb.qdrant_vdb import QdrantVDB
+
+
+def random_unit_vector(rng: random.Random, dim: int, center=None, spread: float = 1.0):
+    vector = [rng.gauss(0.0, spread) for _ in range(dim)]
+    if center is not None:
+        vector = [c + v for c, v in zip(center, vector)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def generate_vectors(rng: random.Random, n: int, dim: int, n_clusters: int):
+    """
+    Clustered vectors, closer to real embeddings than uniform noise.
+    """
+    centers = [random_unit_vector(rng, dim) for _ in range(n_clusters)]
+    for _ in range(n):
+        yield random_unit_vector(rng, dim, center=rng.choice(centers), spread=0.05)
+
+
+def wait_until_indexed(vdb: QdrantVDB, timeout: float = 600.0):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if vdb.client.get_collection(vdb.collection_name).status == CollectionStatus.GREEN:
+            return
+        time.sleep(1.0)
+    print("Warning: the collection is still being optimized, results may not be representative")
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[max(index, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic collection afterwards")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vdb = QdrantVDB()
+    vdb.collection_name = f"{settings.COLLECTION_NAME}-benchmark"
+    dim = vdb.vec_dim
+
+    if vdb.client.collection_exists(vdb.collection_name):
+        vdb.client.delete_collection(vdb.collection_name)
+    vdb.client.create_collection(collection_name=vdb.collection_name, **vdb.collection_options(dim))
+
+    print(f"Inserting {args.points} points of dimension {dim}...")
+    started = time.perf_counter()
+    batch = []
+    for vector in generate_vectors(rng, args.points, dim, args.clusters):
+        batch.append(PointStruct(id=str(uuid4()), vector=vector, payload={}))
+        if len(batch) == args.batch_size:
+            vdb.client.upsert(collection_name=vdb.collection_name, points=batch)
+            batch = []
+    if batch:
+        vdb.client.upsert(collection_name=vdb.collection_name, points=batch)
+    wait_until_indexed(vdb)
+    print(f"Inserted and indexed in {time.perf_counter() - started:.1f}s")
+
+    queries = list(generate_vectors(rng, args.queries, dim, args.clusters))
+    search_params = vdb.search_params()
+    latencies = []
+    recalls = []
+
+    try:
+        for query in queries:
+            exact = vdb.client.query_points(
+                collection_name=vdb.collection_name,
+                query=query,
+                search_params=SearchParams(exact=True),
+                limit=args.k
+            )
+
+            started = time.perf_counter()
+            approximate = vdb.client.query_points(
+                collection_name=vdb.collection_name,
+                query=query,
+                search_params=search_params,
+                limit=args.k
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            expected_ids = {point.id for point in exact.points}
+            found_ids = {point.id for point in approximate.points}
+            recalls.append(len(expected_ids & found_ids) / max(len(expected_ids), 1))
+
+        print(
+            f"hnsw m={settings.QDRANT_HNSW_M} ef_construct={settings.QDRANT_HNSW_EF_CONSTRUCT} "
+            f"ef={settings.QDRANT_HNSW_EF_SEARCH} quantization={settings.QDRANT_QUANTIZATION} "
+            f"vectors_on_disk={settings.QDRANT_VECTORS_ON_DISK}"
+        )
+        print(f"recall@{args.k}: {statistics.mean(recalls):.4f}")
+        print(
+            f"latency ms: p50={percentile(latencies, 50):.2f} p95={percentile(latencies, 95):.2f} "
+            f"p99={percentile(latencies, 99):.2f}"
+        )
+
+    finally:
+        if not args.keep:
+            vdb.client.delete_collection(vdb.collection_name)
+        vdb.close()
+
+
+if __name__ == "__main__":
+    main()
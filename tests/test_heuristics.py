@@ -0,0 +1,47 @@
+from app.infrastructures.protection_agent.heuristics import HeuristicPreFilter, CONFIDENT_MALICIOUS, UNCERTAIN
+
+
+pre_filter = HeuristicPreFilter()
+
+
+def test_gaming_vocabulary_is_left_to_the_agent():
+    result = pre_filter.classify("Let's kill the boss, grab the bomb and a weapon before the next round!")
+
+    assert result.verdict == UNCERTAIN
+
+
+def test_contact_details_with_a_short_link_are_left_to_the_agent():
+    result = pre_filter.classify(
+        "Call me at +1 555 123 4567 or mail me at jane@example.com, my portfolio is at bit.ly/jane-portfolio"
+    )
+
+    assert result.verdict == UNCERTAIN
+
+
+def test_lexicon_alone_never_reaches_the_threshold():
+    result = pre_filter.classify(
+        "urgent: you have won the lottery, send money by western union or gift card, act now, "
+        "keep this between us and don't tell anyone"
+    )
+
+    assert result.verdict == UNCERTAIN
+
+
+def test_low_score_is_not_a_benign_verdict():
+    result = pre_filter.classify(
+        "Hey sweetie, how old are you? Want to meet up somewhere private after school? Your parents don't need to know."
+    )
+
+    assert result.verdict == UNCERTAIN
+
+
+def test_known_phishing_domain_is_malicious():
+    result = pre_filter.classify("Your account is locked, log in at https://paypal-security-check.com/login")
+
+    assert result.verdict == CONFIDENT_MALICIOUS
+
+
+def test_executable_link_with_a_social_security_number_is_malicious():
+    result = pre_filter.classify("Install http://203.0.113.7/update.exe and reply with your SSN 123-45-6789")
+
+    assert result.verdict == CONFIDENT_MALICIOUS
@@ -0,0 +1,54 @@
+import asyncio
+from uuid import uuid4
+
+from app.models.threat_indicator import ThreatIndicator
+from app.models.vdb_outbox import VdbOutbox
+from app.repositories.message_exchange_repository import AsyncMessageExchangeRepository
+
+
+class FakeSession:
+    """
+    Records what the repository adds, and answers the threat insert like the database would.
+    """
+
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def scalar(self, statement):
+        values = {column.key: parameter.value for column, parameter in statement._values.items()}
+        return ThreatIndicator(**values)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def create_deferred_verdict(explanation: str, is_malicious: bool) -> FakeSession:
+    db = FakeSession()
+    asyncio.run(AsyncMessageExchangeRepository(db).create_deferred_verdict(
+        uuid4(),
+        "adversary reply",
+        uuid4(),
+        explanation,
+        is_malicious=is_malicious,
+        user_id=str(uuid4())
+    ))
+    return db
+
+
+def test_benign_verdict_with_explanation_is_not_indexed():
+    db = create_deferred_verdict("Looks like friendly small talk.", is_malicious=False)
+
+    assert not [obj for obj in db.added if isinstance(obj, VdbOutbox)]
+    assert db.commits == 1
+
+
+def test_malicious_verdict_is_queued_for_the_vdb():
+    db = create_deferred_verdict("Phishing link, do not open it.", is_malicious=True)
+
+    outbox_entries = [obj for obj in db.added if isinstance(obj, VdbOutbox)]
+    assert len(outbox_entries) == 1
+    assert outbox_entries[0].content == "adversary reply"
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.database import async_engine, async_session_scope
+from app.models.vdb_outbox import VdbOutbox
+from app.repositories.vdb_outbox_repository import AsyncVdbOutboxRepository
+from app.services.vdb_outbox_worker import VdbOutboxWorker
+
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"),
+    reason="needs TEST_DATABASE_URL pointing to a PostgreSQL database migrated to head"
+)
+
+
+class RecordingVDB:
+    """
+    Keeps the points by message id. Upserts are slow, so a concurrent delete would finish first.
+    """
+
+    def __init__(self):
+        self.points = {}
+
+    def add_vectors(self, vectors, payloads):
+        time.sleep(0.2)
+        for payload in payloads:
+            self.points[payload.message_id] = payload
+
+    def delete_points_batch(self, message_ids):
+        for message_id in message_ids:
+            self.points.pop(message_id, None)
+
+    def flush(self):
+        pass
+
+
+async def enqueue(operation: str, message_id):
+    # one transaction per entry, so that the delete is strictly newer than the upsert
+    async with async_session_scope() as db:
+        outbox_repository = AsyncVdbOutboxRepository(db)
+        if operation == "upsert":
+            outbox_repository.enqueue_upsert(message_id, "you have won a prize, send your bank account")
+        else:
+            outbox_repository.enqueue_delete(message_id)
+        await db.commit()
+
+
+async def count_entries(message_id) -> int:
+    async with async_session_scope() as db:
+        result = await db.execute(select(VdbOutbox.id).where(VdbOutbox.message_id == message_id))
+        return len(result.all())
+
+
+def test_concurrent_drains_apply_the_operations_of_a_message_in_order():
+    async def run():
+        async with async_session_scope() as db:
+            await db.execute(delete(VdbOutbox))
+            await db.commit()
+
+        message_id = uuid4()
+        await enqueue("upsert", message_id)
+        await enqueue("delete", message_id)
+
+        vdb = RecordingVDB()
+        first_worker, second_worker = VdbOutboxWorker(vdb), VdbOutboxWorker(vdb)
+        # one entry per claim, so each worker could otherwise take a different entry of the message
+        first_worker.batch_size = second_worker.batch_size = 1
+
+        claimed = await asyncio.gather(first_worker.drain_once(), second_worker.drain_once())
+        assert sorted(claimed) == [0, 1]
+
+        while await first_worker.drain_once():
+            pass
+
+        assert str(message_id) not in vdb.points
+        assert await count_entries(message_id) == 0
+
+    async def run_and_dispose():
+        try:
+            await run()
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run_and_dispose())